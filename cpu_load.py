@@ -0,0 +1,31 @@
+"""
+CPU Load Helpers
+Shared load generators for the TuxTray test scripts.
+"""
+
+import operator
+import time
+
+NS_PER_SECOND = 1_000_000_000
+
+def burn(n):
+    """Sum of squares below n, looped in C rather than a Python generator."""
+    values = range(n)
+    return sum(map(operator.mul, values, values))
+
+def cpu_worker(work_size, duration, pause=0.01):
+    """
+    Burn CPU in bursts until the duration has passed.
+
+    Run it in its own process: threads share the GIL and only load one core.
+
+    Args:
+        work_size: Numbers summed per burst; larger means a higher load
+        duration: Seconds to keep burning
+        pause: Seconds to sleep between bursts, 0 for a flat-out load
+    """
+    end_ns = time.monotonic_ns() + int(duration * NS_PER_SECOND)
+    while time.monotonic_ns() < end_ns:
+        burn(work_size)
+        if pause:
+            time.sleep(pause)
@@ -11,15 +11,16 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer
-
-from src.config_manager import ConfigManager
-from src.system_monitor import SystemMonitor
-from src.animation_engine import AnimationEngine
-
 def main():
     """Debug the animation system."""
+    # Imported here so importing this module doesn't pull in Qt
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+    
+    from src.config_manager import ConfigManager
+    from src.system_monitor import SystemMonitor
+    from src.animation_engine import AnimationEngine
+    
     print("🐧 TuxTray Animation Debug")
     print("=" * 40)
     
@@ -61,7 +62,7 @@ def main():
     # Frame change counter
     frame_count = {'count': 0, 'last_animation': ''}
     
-    def on_frame_change(pixmap):
+    def on_frame_change(icon):
         frame_count['count'] += 1
         current_anim = engine.current_animation_name if engine.current_animation else 'None'
         if current_anim != frame_count['last_animation']:
@@ -69,6 +70,7 @@ def main():
             frame_count['last_animation'] = current_anim
         
         if frame_count['count'] % 30 == 0:  # Every 30 frames
+            pixmap = engine.get_current_frame()
             print(f"Frame update #{frame_count['count']}: {current_anim} ({pixmap.width()}x{pixmap.height()})")
     
     # Connect frame change signal
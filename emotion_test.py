@@ -17,58 +17,101 @@ The 5 emotion states are:
 import sys
 import time
 import threading
+import mmap
 import multiprocessing
 from pathlib import Path
+from typing import NamedTuple
+
+from cpu_load import cpu_worker
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.system_monitor import SystemMonitor
-from src.config_manager import ConfigManager
+# Monotonic clock units used by the sampling loops
+NS_PER_SECOND = 1_000_000_000
+SAMPLE_INTERVAL_NS = NS_PER_SECOND // 2
+STATUS_INTERVAL_NS = NS_PER_SECOND // 4  # Minimum gap between live status redraws
+
+# Emoji shown next to each emotion in the live status line
+EMOTION_EMOJIS = {
+    "calm": "😌", "active": "🚶", "busy": "🏃",
+    "stressed": "😰", "overloaded": "🥵"
+}
+
+class Scenario(NamedTuple):
+    """A simulated load scenario and the emotion it should trigger."""
+    name: str
+    description: str
+    cpu_load: int
+    ram_load: int
+    duration: int
+    expected: str
+
+# Test scenarios to trigger different emotions
+SCENARIOS = (
+    Scenario("😌 Baseline - Calm State", "System at rest, all resources low",
+             cpu_load=0, ram_load=0, duration=8, expected="calm"),
+    Scenario("🚶 Light Activity - Active State", "Moderate system activity",
+             cpu_load=40, ram_load=0, duration=10, expected="active"),
+    Scenario("🏃 CPU Intensive - Busy State", "High CPU usage, single resource busy",
+             cpu_load=75, ram_load=0, duration=10, expected="busy"),
+    Scenario("😰 Multi-Resource Load - Stressed State", "High CPU and RAM usage simultaneously",
+             cpu_load=80, ram_load=60, duration=12, expected="stressed"),
+    Scenario("🥵 System Overload - Overloaded State", "Critical CPU usage, system at breaking point",
+             cpu_load=95, ram_load=0, duration=8, expected="overloaded"),
+    Scenario("😌 Cool Down - Return to Calm", "System returning to normal after stress",
+             cpu_load=0, ram_load=0, duration=8, expected="calm"),
+)
 
 def simulate_load(load_type, intensity, duration=10):
     """Simulate different types of system load."""
-    threads = []
+    workers = []
     
     if load_type == "cpu" and intensity > 0:
-        def cpu_worker():
-            end_time = time.time() + duration
-            while time.time() < end_time:
-                # CPU intensive calculation
-                sum(i * i for i in range(int(intensity * 1000)))
-                time.sleep(0.01)
+        work_size = int(intensity * 1000)
         
+        # Separate processes aren't serialized by the GIL, so one per loaded core is enough
         cpu_count = multiprocessing.cpu_count()
-        num_threads = max(1, int(intensity / 100 * cpu_count * 2))
+        num_workers = max(1, round(intensity / 100 * cpu_count))
         
-        for _ in range(num_threads):
-            thread = threading.Thread(target=cpu_worker)
-            thread.daemon = True
-            thread.start()
-            threads.append(thread)
+        for _ in range(num_workers):
+            process = multiprocessing.Process(target=cpu_worker, args=(work_size, duration))
+            process.daemon = True
+            process.start()
+            workers.append(process)
     
     elif load_type == "ram" and intensity > 0:
         def ram_worker():
             # Allocate memory to simulate RAM usage
+            memory_mb = int(intensity * 50)  # Scale intensity to MB
             try:
-                # Allocate memory based on intensity
-                memory_mb = int(intensity * 50)  # Scale intensity to MB
-                data = bytearray(memory_mb * 1024 * 1024)
-                time.sleep(duration)
-                del data
-            except MemoryError:
+                # Map anonymous memory and touch every page so it is committed up front
+                data = mmap.mmap(-1, memory_mb * 1024 * 1024)
+                for offset in range(0, len(data), mmap.PAGESIZE):
+                    data[offset] = 1
+            except (MemoryError, OSError):
                 print(f"Warning: Could not allocate {memory_mb}MB of RAM")
                 time.sleep(duration)
+                return
+            
+            try:
+                time.sleep(duration)
+            finally:
+                data.close()
         
         thread = threading.Thread(target=ram_worker)
         thread.daemon = True
         thread.start()
-        threads.append(thread)
+        workers.append(thread)
     
-    return threads
+    return workers
 
 def demonstrate_emotion_states():
     """Demonstrate each emotion state with simulated system loads."""
+    # Imported here so load-worker processes don't pay for psutil and config setup
+    from src.system_monitor import SystemMonitor
+    from src.config_manager import ConfigManager
+    
     config = ConfigManager()
     monitor = SystemMonitor()
     
@@ -81,6 +124,7 @@ def demonstrate_emotion_states():
     
     # Display emotion thresholds
     emotion_thresholds = config.get_emotion_thresholds()
+    threshold_values = config.get_emotion_threshold_values()
     print("📊 Emotion State Definitions:")
     print("-" * 30)
     
@@ -102,115 +146,75 @@ def demonstrate_emotion_states():
     print("🎬 Starting Emotion Demonstration...")
     print("=" * 50)
     
-    # Test scenarios to trigger different emotions
-    scenarios = [
-        {
-            "name": "😌 Baseline - Calm State",
-            "description": "System at rest, all resources low",
-            "cpu_load": 0,
-            "ram_load": 0, 
-            "duration": 8,
-            "expected": "calm"
-        },
-        {
-            "name": "🚶 Light Activity - Active State", 
-            "description": "Moderate system activity",
-            "cpu_load": 40,
-            "ram_load": 0,
-            "duration": 10,
-            "expected": "active"
-        },
-        {
-            "name": "🏃 CPU Intensive - Busy State",
-            "description": "High CPU usage, single resource busy", 
-            "cpu_load": 75,
-            "ram_load": 0,
-            "duration": 10,
-            "expected": "busy"
-        },
-        {
-            "name": "😰 Multi-Resource Load - Stressed State",
-            "description": "High CPU and RAM usage simultaneously",
-            "cpu_load": 80,
-            "ram_load": 60,
-            "duration": 12,
-            "expected": "stressed"
-        },
-        {
-            "name": "🥵 System Overload - Overloaded State", 
-            "description": "Critical CPU usage, system at breaking point",
-            "cpu_load": 95,
-            "ram_load": 0,
-            "duration": 8,
-            "expected": "overloaded"
-        },
-        {
-            "name": "😌 Cool Down - Return to Calm",
-            "description": "System returning to normal after stress",
-            "cpu_load": 0,
-            "ram_load": 0,
-            "duration": 8,
-            "expected": "calm"
-        }
-    ]
-    
-    for i, scenario in enumerate(scenarios, 1):
-        print(f"\nScenario {i}/6: {scenario['name']}")
-        print(f"Description: {scenario['description']}")
-        print(f"Load: CPU {scenario['cpu_load']}%, RAM {scenario['ram_load']}%")
-        print(f"Expected emotion: {scenario['expected'].upper()}")
+    for i, scenario in enumerate(SCENARIOS, 1):
+        print(f"\nScenario {i}/{len(SCENARIOS)}: {scenario.name}")
+        print(f"Description: {scenario.description}")
+        print(f"Load: CPU {scenario.cpu_load}%, RAM {scenario.ram_load}%")
+        print(f"Expected emotion: {scenario.expected.upper()}")
         print("─" * 50)
         
         # Start load simulation
-        cpu_threads = simulate_load("cpu", scenario['cpu_load'], scenario['duration'])
-        ram_threads = simulate_load("ram", scenario['ram_load'], scenario['duration'])
-        all_threads = cpu_threads + ram_threads
+        cpu_workers = simulate_load("cpu", scenario.cpu_load, scenario.duration)
+        ram_workers = simulate_load("ram", scenario.ram_load, scenario.duration)
+        all_workers = cpu_workers + ram_workers
+        
+        # Prime psutil's CPU counters so the first sample is meaningful
+        monitor.get_system_stats()
         
         # Monitor system and emotion states
-        start_time = time.time()
-        samples = []
+        duration = scenario.duration
+        start_ns = time.monotonic_ns()
+        end_ns = start_ns + int(duration * NS_PER_SECOND)
+        next_tick_ns = start_ns
+        last_status_ns = 0
+        sample_count = 0
+        stress_total = 0.0
+        last_analysis = None
         
-        while time.time() - start_time < scenario['duration']:
+        while time.monotonic_ns() < end_ns:
             stats = monitor.get_system_stats()
-            analysis = monitor.get_emotion_analysis(stats, emotion_thresholds)
-            samples.append(analysis)
+            analysis = monitor.get_emotion_analysis(stats, threshold_values)
+            sample_count += 1
+            stress_total += analysis.overall_stress
+            last_analysis = analysis
             
-            elapsed = int(time.time() - start_time)
+            now_ns = time.monotonic_ns()
+            elapsed = (now_ns - start_ns) // NS_PER_SECOND
             
             # Get emoji for current emotion
-            emotion_emojis = {
-                "calm": "😌", "active": "🚶", "busy": "🏃", 
-                "stressed": "😰", "overloaded": "🥵"
-            }
-            emoji = emotion_emojis.get(analysis['emotion'], "🤔")
-            
-            # Show real-time status
-            status = (f"[{elapsed:2d}s] CPU:{stats.cpu_percent:5.1f}% "
-                     f"RAM:{stats.ram_percent:4.1f}% "
-                     f"Net:{stats.network_kbps:6.1f}KB/s "
-                     f"→ {emoji} {analysis['emotion'].upper()} "
-                     f"({analysis['overall_stress']:.0f}% stress)")
+            emoji = EMOTION_EMOJIS.get(analysis.emotion, "🤔")
             
-            print(f"\r{status}", end="", flush=True)
-            time.sleep(0.5)
+            # Show real-time status (rate-limited, one write + flush per redraw)
+            if now_ns - last_status_ns >= STATUS_INTERVAL_NS:
+                last_status_ns = now_ns
+                status = (f"[{elapsed:2d}s] CPU:{stats.cpu_percent:5.1f}% "
+                         f"RAM:{stats.ram_percent:4.1f}% "
+                         f"Net:{stats.network_kbps:6.1f}KB/s "
+                         f"→ {emoji} {analysis.emotion.upper()} "
+                         f"({analysis.overall_stress:.0f}% stress)")
+                sys.stdout.write(f"\r{status}")
+                sys.stdout.flush()
+            # Pace samples against a fixed schedule so work in the loop doesn't add drift
+            next_tick_ns += SAMPLE_INTERVAL_NS
+            time.sleep(max(0, next_tick_ns - time.monotonic_ns()) / NS_PER_SECOND)
         
         print()  # New line after progress
         
-        # Wait for threads to complete
-        for thread in all_threads:
-            if thread.is_alive():
-                thread.join()
+        # Wait for load workers to complete
+        for worker in all_workers:
+            if worker.is_alive():
+                worker.join()
         
         # Show scenario summary
-        if samples:
-            final_emotion = samples[-1]['emotion']
-            avg_stress = sum(s['overall_stress'] for s in samples) / len(samples)
+        if sample_count:
+            final_emotion = last_analysis.emotion
+            avg_stress = stress_total / sample_count
             
-            success = "✅" if final_emotion == scenario['expected'] else "⚠️"
+            success = "✅" if final_emotion == scenario.expected else "⚠️"
             print(f"{success} Final emotion: {final_emotion.upper()} (avg stress: {avg_stress:.1f}%)")
             
-            if samples[-1]['active_stressors']:
-                print(f"   Active stressors: {', '.join(samples[-1]['active_stressors'])}")
+            if last_analysis.active_stressors:
+                print(f"   Active stressors: {', '.join(last_analysis.active_stressors)}")
         
         time.sleep(2)  # Brief pause between scenarios
     
@@ -4,12 +4,96 @@ GIF Frame Extractor for TuxTray
 Extracts animation frames from GIF files and organizes them into appropriate directories.
 """
 
+import itertools
 import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageSequence
 import re
 
-def extract_gif_frames(gif_path, output_dir, target_width=450, target_height=595):
+# Fast PNG encoding: optimize=True retries several zlib passes per frame, while
+# level 1 with the RLE strategy suits the large transparent padding areas
+PNG_SAVE_OPTIONS = {"compress_level": 1, "compress_type": zlib.Z_RLE}
+
+# Per-process canvas reused across frames instead of allocating one per frame
+_canvas = None
+
+def _fit_geometry(size, target_width, target_height):
+    """
+    Calculate the scaled size and centering offsets for a frame.
+    
+    Args:
+        size: Original (width, height) of the frame
+        target_width: Target width for frames
+        target_height: Target height for frames
+        
+    Returns:
+        Tuple of (new_width, new_height, x_offset, y_offset)
+    """
+    # Calculate scaling to fit target dimensions while maintaining aspect ratio
+    original_width, original_height = size
+    width_scale = target_width / original_width
+    height_scale = target_height / original_height
+    scale = min(width_scale, height_scale)
+    
+    # Calculate new dimensions
+    new_width = int(original_width * scale)
+    new_height = int(original_height * scale)
+    
+    # Center the resized frame
+    x_offset = (target_width - new_width) // 2
+    y_offset = (target_height - new_height) // 2
+    
+    return new_width, new_height, x_offset, y_offset
+
+def _render_frame(frame, frame_path, target_width, target_height, geometry, opaque):
+    """
+    Resize a decoded frame onto the target canvas and save it as PNG.
+    
+    Runs in a worker process so PNG encoding is spread across cores.
+    
+    Args:
+        frame: Decoded RGBA frame
+        frame_path: Output path for the PNG
+        target_width: Target width for frames
+        target_height: Target height for frames
+        geometry: Precomputed (new_width, new_height, x_offset, y_offset)
+        opaque: Whether the GIF frames have no transparent pixels
+    """
+    global _canvas
+    
+    new_width, new_height, x_offset, y_offset = geometry
+    
+    # Resize frame with high quality (skip when already the right size)
+    if frame.size != (new_width, new_height):
+        resized_frame = frame.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    else:
+        resized_frame = frame
+    
+    if (new_width, new_height) == (target_width, target_height):
+        # Frame fills the target exactly, no padding canvas needed
+        final_frame = resized_frame
+    else:
+        if _canvas is None or _canvas.size != (target_width, target_height):
+            # Create canvas with target dimensions and transparent background
+            _canvas = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
+        
+        final_frame = _canvas
+        if opaque:
+            # Opaque frames fully overwrite the same region, padding stays transparent
+            final_frame.paste(resized_frame, (x_offset, y_offset))
+        else:
+            # Clear the previous frame before blending the next one in
+            final_frame.paste((0, 0, 0, 0), (0, 0, target_width, target_height))
+            final_frame.paste(resized_frame, (x_offset, y_offset), resized_frame)
+    
+    final_frame.save(frame_path, 'PNG', **PNG_SAVE_OPTIONS)
+
+def extract_gif_frames(gif_path, output_dir, target_width=450, target_height=595,
+                       max_workers=None):
     """
     Extract frames from a GIF file and save as PNG sequences.
     
@@ -18,6 +102,7 @@ def extract_gif_frames(gif_path, output_dir, target_width=450, target_height=595
         output_dir: Directory to save extracted frames
         target_width: Target width for frames
         target_height: Target height for frames
+        max_workers: Processes used to encode frames (defaults to all cores)
         
     Returns:
         Number of frames extracted
@@ -35,63 +120,89 @@ def extract_gif_frames(gif_path, output_dir, target_width=450, target_height=595
     try:
         # Open the GIF
         with Image.open(gif_path) as gif:
-            frame_count = 0
-            
             print(f"🎬 Processing GIF: {gif_path.name}")
             print(f"   Original size: {gif.size}")
             print(f"   Target size: {target_width}x{target_height}")
             
-            # Extract each frame
-            try:
-                while True:
-                    # Convert frame to RGBA if needed
-                    frame = gif.copy()
-                    if frame.mode != 'RGBA':
-                        frame = frame.convert('RGBA')
-                    
-                    # Calculate scaling to fit target dimensions while maintaining aspect ratio
-                    original_width, original_height = frame.size
-                    width_scale = target_width / original_width
-                    height_scale = target_height / original_height
-                    scale = min(width_scale, height_scale)
-                    
-                    # Calculate new dimensions
-                    new_width = int(original_width * scale)
-                    new_height = int(original_height * scale)
-                    
-                    # Resize frame with high quality
-                    resized_frame = frame.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    
-                    # Create canvas with target dimensions and transparent background
-                    final_frame = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
-                    
-                    # Center the resized frame
-                    x_offset = (target_width - new_width) // 2
-                    y_offset = (target_height - new_height) // 2
-                    final_frame.paste(resized_frame, (x_offset, y_offset), resized_frame)
-                    
-                    # Save frame with zero-padded numbering
-                    frame_filename = f"frame_{frame_count:03d}.png"
-                    frame_path = output_dir / frame_filename
-                    final_frame.save(frame_path, 'PNG', optimize=True)
-                    
+            # Decode lazily in a single forward pass, so workers start encoding
+            # the first frames while later ones are still being decoded
+            frames = (frame.convert('RGBA') for frame in ImageSequence.Iterator(gif))
+            first_frame = next(frames)
+            
+            # Check transparency once per GIF; opaque frames skip the alpha-mask blend
+            opaque = first_frame.getextrema()[3] == (255, 255)
+            
+            # All frames of a GIF share its dimensions, so compute the geometry once
+            geometry = _fit_geometry(first_frame.size, target_width, target_height)
+            
+            # Resize and encode frames in parallel, saving with zero-padded numbering
+            frame_paths = (output_dir / f"frame_{index:03d}.png" for index in itertools.count())
+            worker = partial(_render_frame, target_width=target_width, target_height=target_height,
+                             geometry=geometry, opaque=opaque)
+            
+            workers = max_workers or os.cpu_count()
+            # executor.map would submit (and so decode) every frame up front; cap the
+            # frames in flight so decoding waits for the encoders instead
+            max_in_flight = 2 * workers
+            pending = deque()
+            frame_count = 0
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for frame, frame_path in zip(itertools.chain([first_frame], frames), frame_paths):
+                    if len(pending) >= max_in_flight:
+                        pending.popleft().result()
+                        print(f"   ✅ Extracted frame {frame_count:03d}")
+                        frame_count += 1
+                    pending.append(executor.submit(worker, frame, frame_path))
+                
+                while pending:
+                    pending.popleft().result()
                     print(f"   ✅ Extracted frame {frame_count:03d}")
                     frame_count += 1
-                    
-                    # Move to next frame
-                    gif.seek(gif.tell() + 1)
-                    
-            except EOFError:
-                # End of GIF reached
-                pass
-            
-            print(f"   🎉 Successfully extracted {frame_count} frames")
-            return frame_count
+        
+        print(f"   🎉 Successfully extracted {frame_count} frames")
+        return frame_count
             
     except Exception as e:
         print(f"❌ Error processing {gif_path}: {e}")
         return 0
 
+def _extract_gif_group(gif_files, output_dir, max_workers):
+    """
+    Extract GIFs that share an output directory, one after another.
+    
+    Keeping them sequential preserves the "last GIF wins" overwrite order
+    when several GIFs map to the same animation type.
+    
+    Returns:
+        Number of frames extracted
+    """
+    return sum(extract_gif_frames(gif_file, output_dir, max_workers=max_workers)
+               for gif_file in gif_files)
+
+def _scan_files(directory, suffix):
+    """
+    List files in a directory with the given suffix.
+    
+    Args:
+        directory: Directory to scan
+        suffix: File suffix to match (e.g. ".gif")
+        
+    Returns:
+        List of matching file paths
+    """
+    if not os.path.isdir(directory):
+        return []
+    
+    with os.scandir(directory) as entries:
+        return [Path(entry.path) for entry in entries
+                if entry.name.endswith(suffix) and entry.is_file()]
+
+def _count_files(directory, suffix):
+    """Count files in a directory with the given suffix."""
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(suffix))
+
 def determine_animation_type(gif_filename):
     """
     Determine animation type based on GIF filename.
@@ -133,10 +244,10 @@ def main():
     gif_files = []
     
     # Check in project root
-    gif_files.extend(project_root.glob("*.gif"))
+    gif_files.extend(_scan_files(project_root, ".gif"))
     
     # Check in assets directory
-    gif_files.extend(assets_dir.glob("*.gif"))
+    gif_files.extend(_scan_files(assets_dir, ".gif"))
     
     if not gif_files:
         print("❌ No GIF files found!")
@@ -148,22 +259,28 @@ def main():
     
     print()
     
-    total_frames = 0
-    
+    # Group GIFs by output directory (determined from the animation type in the filename)
+    groups = {}
     for gif_file in gif_files:
-        # Determine animation type from filename
         animation_type = determine_animation_type(gif_file.name)
-        
-        # Create output directory
-        output_dir = skins_dir / animation_type
-        
         print(f"🎯 Processing: {gif_file.name} → {animation_type}/ directory")
-        
-        # Extract frames
-        frame_count = extract_gif_frames(gif_file, output_dir)
-        total_frames += frame_count
-        
-        print()
+        groups.setdefault(skins_dir / animation_type, []).append(gif_file)
+    
+    print()
+    
+    total_frames = 0
+    
+    # Extract independent directories in parallel, splitting the cores between them
+    cpu_count = os.cpu_count() or 1
+    frame_workers = max(1, cpu_count // len(groups))
+    
+    with ProcessPoolExecutor(max_workers=min(len(groups), cpu_count)) as executor:
+        futures = [executor.submit(_extract_gif_group, group_files, output_dir, frame_workers)
+                   for output_dir, group_files in groups.items()]
+        for future in as_completed(futures):
+            total_frames += future.result()
+    
+    print()
     
     print("=" * 50)
     print(f"✅ Extraction complete!")
@@ -174,7 +291,7 @@ def main():
     for anim_type in ['idle', 'walk', 'run']:
         anim_dir = skins_dir / anim_type
         if anim_dir.exists():
-            frame_count = len(list(anim_dir.glob("*.png")))
+            frame_count = _count_files(anim_dir, ".png")
             print(f"{anim_type.title()} animation: {frame_count} frames")
     
     print(f"\n🎉 Ready for TuxTray! All frames are in assets/skins/default/")
@@ -6,41 +6,61 @@ Demonstrates all animation features working together.
 
 import sys
 import time
-import threading
 import multiprocessing
 from pathlib import Path
+from typing import NamedTuple
+
+from cpu_load import cpu_worker
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.system_monitor import SystemMonitor
-from src.config_manager import ConfigManager
+# Monotonic clock units used by the sampling loops
+NS_PER_SECOND = 1_000_000_000
+SAMPLE_INTERVAL_NS = NS_PER_SECOND // 2
+STATUS_INTERVAL_NS = NS_PER_SECOND // 4  # Minimum gap between live status redraws
+
+# Emoji shown next to each animation state in the live status line
+STATE_EMOJIS = {"idle": "🟢", "walk": "🟡", "run": "🔴"}
+
+class Scenario(NamedTuple):
+    """A target CPU load and the animation it should produce."""
+    name: str
+    target_cpu: int
+    duration: int
+    description: str
+
+# Test scenarios
+SCENARIOS = (
+    Scenario("🟢 Idle State", 10, 5, "Penguin should be calmly sitting"),
+    Scenario("🟡 Walk State", 50, 8, "Penguin should be waddle-walking"),
+    Scenario("🔴 Run State", 90, 8, "Penguin should be running frantically"),
+    Scenario("🟢 Cool Down", 5, 5, "Penguin should return to idle"),
+)
 
 def simulate_cpu_load(target_percent, duration=5):
     """Simulate specific CPU load percentage."""
-    def worker():
-        end_time = time.time() + duration
-        while time.time() < end_time:
-            # Adjust work intensity based on target percentage
-            work_intensity = int(target_percent * 1000)
-            sum(i * i for i in range(work_intensity))
-            time.sleep(0.01)  # Small sleep to allow CPU measurement
+    work_intensity = int(target_percent * 1000)
     
-    # Calculate number of threads needed
+    # Calculate number of processes needed (not serialized by the GIL like threads)
     cpu_count = multiprocessing.cpu_count()
-    num_threads = max(1, int(target_percent / 100 * cpu_count * 2))
+    num_workers = max(1, round(target_percent / 100 * cpu_count))
     
-    threads = []
-    for _ in range(num_threads):
-        thread = threading.Thread(target=worker)
-        thread.daemon = True
-        thread.start()
-        threads.append(thread)
+    workers = []
+    for _ in range(num_workers):
+        process = multiprocessing.Process(target=cpu_worker, args=(work_intensity, duration))
+        process.daemon = True
+        process.start()
+        workers.append(process)
     
-    return threads
+    return workers
 
 def main():
     """Demonstrate TuxTray animation states."""
+    # Imported here so load-worker processes don't pay for psutil and config setup
+    from src.system_monitor import SystemMonitor
+    from src.config_manager import ConfigManager
+    
     print("🐧 TuxTray Final Animation Test")
     print("=" * 50)
     print("This test will simulate different CPU loads to demonstrate")
@@ -58,18 +78,10 @@ def main():
     print(f"  🔴 Run:  > {thresholds['walk']}%")
     print()
     
-    # Test scenarios
-    scenarios = [
-        ("🟢 Idle State", 10, 5, "Penguin should be calmly sitting"),
-        ("🟡 Walk State", 50, 8, "Penguin should be waddle-walking"),
-        ("🔴 Run State", 90, 8, "Penguin should be running frantically"),
-        ("🟢 Cool Down", 5, 5, "Penguin should return to idle")
-    ]
-    
     print("🎬 Starting Animation Demonstration...")
     print("=" * 50)
     
-    for i, (name, target_cpu, duration, description) in enumerate(scenarios, 1):
+    for i, (name, target_cpu, duration, description) in enumerate(SCENARIOS, 1):
         print(f"\nScenario {i}: {name}")
         print(f"Target CPU: {target_cpu}% for {duration} seconds")
         print(f"Expected: {description}")
@@ -77,28 +89,42 @@ def main():
         
         # Start CPU simulation
         if target_cpu > 20:
-            threads = simulate_cpu_load(target_cpu, duration)
+            workers = simulate_cpu_load(target_cpu, duration)
         else:
-            threads = []
+            workers = []
+        
+        # Prime psutil's CPU counters so the first sample is meaningful
+        monitor.get_system_stats()
         
         # Monitor for the duration
-        start_time = time.time()
-        while time.time() - start_time < duration:
+        start_ns = time.monotonic_ns()
+        end_ns = start_ns + int(duration * NS_PER_SECOND)
+        next_tick_ns = start_ns
+        last_status_ns = 0
+        while time.monotonic_ns() < end_ns:
             stats = monitor.get_system_stats()
             state = monitor.determine_animation_state(stats, "cpu", thresholds)
             
             # Get emoji for state
-            emoji = "🟢" if state == "idle" else "🟡" if state == "walk" else "🔴"
+            emoji = STATE_EMOJIS[state]
+            
+            now_ns = time.monotonic_ns()
+            elapsed = (now_ns - start_ns) // NS_PER_SECOND
             
-            elapsed = int(time.time() - start_time)
-            print(f"[{elapsed:2d}s] CPU: {stats.cpu_percent:5.1f}% → {emoji} {state.upper()}", end="\r")
+            # Show real-time status (rate-limited, one write + flush per redraw)
+            if now_ns - last_status_ns >= STATUS_INTERVAL_NS:
+                last_status_ns = now_ns
+                sys.stdout.write(f"[{elapsed:2d}s] CPU: {stats.cpu_percent:5.1f}% → {emoji} {state.upper()}\r")
+                sys.stdout.flush()
             
-            time.sleep(0.5)
+            # Pace samples against a fixed schedule so work in the loop doesn't add drift
+            next_tick_ns += SAMPLE_INTERVAL_NS
+            time.sleep(max(0, next_tick_ns - time.monotonic_ns()) / NS_PER_SECOND)
         
-        # Wait for threads to finish
-        for thread in threads:
-            if thread.is_alive():
-                thread.join()
+        # Wait for load workers to finish
+        for worker in workers:
+            if worker.is_alive():
+                worker.join()
         
         print()  # New line after progress
         time.sleep(1)  # Brief pause between scenarios
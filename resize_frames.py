@@ -5,9 +5,132 @@ Target: 450x595 pixels (width x height)
 """
 
 import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from PIL import Image
 
+# Fast PNG encoding: optimize=True retries several zlib passes per frame, while
+# level 1 with the RLE strategy suits the large transparent padding areas
+PNG_SAVE_OPTIONS = {"compress_level": 1, "compress_type": zlib.Z_RLE}
+
+# Per-process canvas reused across frames, and the region last pasted onto it
+_canvas = None
+_canvas_box = None
+
+def _get_canvas(target_width, target_height):
+    """Return this worker's transparent-padded canvas, creating it on first use."""
+    global _canvas, _canvas_box
+    
+    if _canvas is None or _canvas.size != (target_width, target_height):
+        # Create a new image with target dimensions and transparent background
+        _canvas = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
+        _canvas_box = None
+    
+    return _canvas
+
+def _fit_geometry(size, target_width, target_height):
+    """
+    Calculate the scaled size and centering offsets for a frame.
+    
+    Args:
+        size: Original (width, height) of the frame
+        target_width: Target width in pixels
+        target_height: Target height in pixels
+        
+    Returns:
+        Tuple of (new_width, new_height, x_offset, y_offset)
+    """
+    original_width, original_height = size
+    
+    # Use the smaller scale to ensure the image fits within target dimensions
+    scale = min(target_width / original_width, target_height / original_height)
+    
+    new_width = int(original_width * scale)
+    new_height = int(original_height * scale)
+    
+    # Position to center the resized image
+    x_offset = (target_width - new_width) // 2
+    y_offset = (target_height - new_height) // 2
+    
+    return new_width, new_height, x_offset, y_offset
+
+def _resize_one(png_file, target_width, target_height, probe_size, geometry, opaque):
+    """
+    Resize a single PNG frame in place.
+    
+    Runs in a worker process, so it reports back a status line instead of
+    printing directly.
+    
+    Args:
+        png_file: Path to the PNG frame
+        target_width: Target width in pixels
+        target_height: Target height in pixels
+        probe_size: Source size the precomputed geometry was derived from
+        geometry: Precomputed (new_width, new_height, x_offset, y_offset)
+        opaque: Whether the source frames have no transparent pixels
+        
+    Returns:
+        Tuple of (success, status message)
+    """
+    global _canvas_box
+    
+    try:
+        with Image.open(png_file) as img:
+            # Opening only reads the header, so already-processed frames cost no decode
+            if img.size == (target_width, target_height):
+                return True, f"  ✓ {png_file.name}: already {target_width}x{target_height}, skipped"
+            
+            # Convert to RGBA if not already
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
+            
+            original_width, original_height = img.size
+            
+            # Frames in a directory normally share dimensions; only recompute on mismatch
+            if img.size == probe_size:
+                new_width, new_height, x_offset, y_offset = geometry
+            else:
+                new_width, new_height, x_offset, y_offset = _fit_geometry(
+                    img.size, target_width, target_height
+                )
+            
+            # Resize the image with high quality (skip when already the right size)
+            if img.size != (new_width, new_height):
+                resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            else:
+                resized_img = img
+            
+            if (new_width, new_height) == (target_width, target_height):
+                # Frame fills the target exactly, no padding canvas needed
+                final_img = resized_img
+            else:
+                final_img = _get_canvas(target_width, target_height)
+                box = (x_offset, y_offset, x_offset + new_width, y_offset + new_height)
+                
+                # Paste the resized image onto the centered canvas
+                # (opaque sources don't need the alpha-mask blend)
+                if opaque and box == _canvas_box:
+                    # Same region as the previous frame, which this paste fully overwrites
+                    final_img.paste(resized_img, (x_offset, y_offset))
+                else:
+                    # Clear the previous frame before drawing the new one
+                    final_img.paste((0, 0, 0, 0), (0, 0, target_width, target_height))
+                    if opaque:
+                        final_img.paste(resized_img, (x_offset, y_offset))
+                    else:
+                        final_img.paste(resized_img, (x_offset, y_offset), resized_img)
+                _canvas_box = box
+            
+            # Save the processed frame
+            final_img.save(png_file, 'PNG', **PNG_SAVE_OPTIONS)
+            
+            return True, f"  ✓ {png_file.name}: {original_width}x{original_height} → {target_width}x{target_height}"
+            
+    except Exception as e:
+        return False, f"  ✗ Error processing {png_file.name}: {e}"
+
 def resize_frames(animation_path, target_width=450, target_height=595):
     """
     Resize all PNG frames in an animation directory.
@@ -24,7 +147,9 @@ def resize_frames(animation_path, target_width=450, target_height=595):
         return 0
     
     # Get all PNG files
-    png_files = list(animation_path.glob("*.png"))
+    with os.scandir(animation_path) as entries:
+        png_files = [Path(entry.path) for entry in entries
+                     if entry.name.endswith(".png") and entry.is_file()]
     
     if not png_files:
         print(f"No PNG files found in {animation_path}")
@@ -32,51 +157,27 @@ def resize_frames(animation_path, target_width=450, target_height=595):
     
     print(f"Processing {len(png_files)} frames in {animation_path.name}...")
     
+    # Probe the first frame once; all frames of an animation share dimensions
+    try:
+        with Image.open(png_files[0]) as probe:
+            probe_size = probe.size
+            opaque = probe.convert('RGBA').getextrema()[3] == (255, 255)
+    except Exception as e:
+        print(f"  ✗ Error reading {png_files[0].name}: {e}")
+        return 0
+    
+    geometry = _fit_geometry(probe_size, target_width, target_height)
+    worker = partial(_resize_one, target_width=target_width, target_height=target_height,
+                     probe_size=probe_size, geometry=geometry, opaque=opaque)
+    
     processed = 0
     
-    for png_file in png_files:
-        try:
-            # Open the image
-            with Image.open(png_file) as img:
-                # Convert to RGBA if not already
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                
-                # Calculate scaling to fit the target dimensions while maintaining aspect ratio
-                original_width, original_height = img.size
-                
-                # Calculate scale factors for both dimensions
-                width_scale = target_width / original_width
-                height_scale = target_height / original_height
-                
-                # Use the smaller scale to ensure the image fits within target dimensions
-                scale = min(width_scale, height_scale)
-                
-                # Calculate new dimensions
-                new_width = int(original_width * scale)
-                new_height = int(original_height * scale)
-                
-                # Resize the image with high quality
-                resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Create a new image with target dimensions and transparent background
-                final_img = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
-                
-                # Calculate position to center the resized image
-                x_offset = (target_width - new_width) // 2
-                y_offset = (target_height - new_height) // 2
-                
-                # Paste the resized image onto the centered canvas
-                final_img.paste(resized_img, (x_offset, y_offset), resized_img)
-                
-                # Save the processed frame
-                final_img.save(png_file, 'PNG', optimize=True)
-                
+    # PNG decode/encode is CPU-bound, so spread the frames across cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for success, message in executor.map(worker, png_files, chunksize=4):
+            print(message)
+            if success:
                 processed += 1
-                print(f"  ✓ {png_file.name}: {original_width}x{original_height} → {target_width}x{target_height}")
-                
-        except Exception as e:
-            print(f"  ✗ Error processing {png_file.name}: {e}")
     
     return processed
 
@@ -107,7 +208,8 @@ def main():
     for anim_name in animations:
         anim_path = animations_base / anim_name
         if anim_path.exists():
-            frame_count = len(list(anim_path.glob("*.png")))
+            with os.scandir(anim_path) as entries:
+                frame_count = sum(1 for entry in entries if entry.name.endswith(".png"))
             print(f"{anim_name.title()} animation: {frame_count} frames")
 
 if __name__ == "__main__":
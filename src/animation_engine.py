@@ -3,86 +3,178 @@ Animation Engine for TuxTray
 Handles loading and cycling through animation frames for the penguin mascot.
 """
 
+import hashlib
+import logging
 import os
-import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from PySide6.QtGui import QPixmap, QIcon
-from PySide6.QtCore import QTimer, QObject, Signal, Qt
+from typing import Any, List, Dict, Optional, Set, Tuple
+from PySide6.QtGui import QPixmap, QIcon, QImage, QPainter
+from PySide6.QtCore import QTimer, QObject, QSize, Signal, Qt, QStandardPaths
 
 from .config_manager import ConfigManager
 
+log = logging.getLogger(__name__)
+
+
+def _compact_image(image: QImage) -> QImage:
+    """
+    Convert an image to a smaller pixel format for long-term storage.
+    
+    Sprites with at most 256 distinct colours are stored losslessly as 8-bit
+    indexed images; anything else falls back to 16-bit ARGB4444.
+    
+    Args:
+        image: Image in a 32-bit format
+        
+    Returns:
+        Image in Format_Indexed8 or Format_ARGB4444_Premultiplied
+    """
+    # Colour tables hold unpremultiplied ARGB values
+    argb = image.convertToFormat(QImage.Format_ARGB32)
+    colors = set(memoryview(argb.constBits()).cast("I"))
+    
+    if len(colors) <= 256:
+        return argb.convertToFormat(QImage.Format_Indexed8, list(colors), Qt.ThresholdDither)
+    
+    return image.convertToFormat(QImage.Format_ARGB4444_Premultiplied)
+
 
 class Animation:
     """Represents a single animation sequence."""
     
-    def __init__(self, name: str, frames: List[QPixmap], fps: int = 24, loop: bool = True):
+    def __init__(self, name: str, frames: List[QImage], fps: int = 24, loop: bool = True):
         """
         Initialize an animation.
         
         Args:
             name: Animation name (idle, walk, run)
-            frames: List of QPixmap frames
+            frames: List of decoded frames, packed into a single atlas image
             fps: Frames per second
             loop: Whether animation should loop
         """
         self.name = name
-        self.frames = frames
+        self.frame_count = len(frames)
+        # Power-of-two frame counts wrap with a bitmask instead of a modulo
+        n = self.frame_count
+        self._wrap_mask = n - 1 if n > 1 and n & (n - 1) == 0 else 0
+        self.frame_width = max((frame.width() for frame in frames), default=0)
+        self.frame_height = max((frame.height() for frame in frames), default=0)
+        self.atlas = self._build_atlas(frames)
         self.fps = fps
         self.loop = loop
         self.frame_duration_ms = int(1000 / fps) if fps > 0 else 42  # ~24fps default
         self.current_frame = 0
-        self.last_frame_time = 0
+        # Per-frame icons, built the first time each frame is shown and reused every loop.
+        # Each holds a full 32-bit pixmap, so only the playing animation keeps them
+        self.icons: List[Optional[QIcon]] = [None] * self.frame_count
+    
+    def _build_atlas(self, frames: List[QImage]) -> QImage:
+        """Paint all frames side by side into one strip image, stored compactly."""
+        if not frames:
+            return QImage()
+        
+        atlas = QImage(self.frame_width * self.frame_count, self.frame_height,
+                       QImage.Format_ARGB32_Premultiplied)
+        atlas.fill(Qt.transparent)
+        
+        painter = QPainter(atlas)
+        for i, frame in enumerate(frames):
+            painter.drawImage(i * self.frame_width, 0, frame)
+        painter.end()
+        
+        return _compact_image(atlas)
+    
+    def drop_icons(self) -> None:
+        """Free the cached per-frame icons; the compact atlas is kept."""
+        self.icons = [None] * self.frame_count
+    
+    def release(self) -> None:
+        """Free the frame atlas; the animation has no frames afterwards."""
+        self.atlas = QImage()
+        self.icons = []
+        self.frame_count = 0
+        self._wrap_mask = 0
+        self.current_frame = 0
     
     def get_current_frame(self) -> QPixmap:
         """Get the current animation frame."""
-        if not self.frames:
+        if not self.frame_count:
             return QPixmap()
-        return self.frames[self.current_frame]
+        return QPixmap.fromImage(self.atlas.copy(self.current_frame * self.frame_width, 0,
+                                                 self.frame_width, self.frame_height))
+    
+    def get_current_icon(self) -> QIcon:
+        """Get the current animation frame as a reusable tray icon."""
+        if not self.frame_count:
+            return QIcon()
+        
+        icon = self.icons[self.current_frame]
+        if icon is None:
+            icon = QIcon(self.get_current_frame())
+            self.icons[self.current_frame] = icon
+        return icon
     
     def advance_frame(self) -> bool:
         """
-        Advance to next frame if enough time has passed.
+        Advance to the next frame. Called once per frame_duration_ms.
         
         Returns:
             True if frame was advanced, False otherwise
         """
-        current_time = int(time.time() * 1000)  # milliseconds
+        if self._wrap_mask:
+            self.current_frame = (self.current_frame + 1) & self._wrap_mask
+            return True
         
-        if current_time - self.last_frame_time >= self.frame_duration_ms:
-            if self.frames:
-                self.current_frame = (self.current_frame + 1) % len(self.frames)
-                self.last_frame_time = current_time
-                return True
+        if self.frame_count:
+            self.current_frame = (self.current_frame + 1) % self.frame_count
+            return True
         
         return False
     
     def reset(self) -> None:
         """Reset animation to first frame."""
         self.current_frame = 0
-        self.last_frame_time = int(time.time() * 1000)
 
 
 class AnimationEngine(QObject):
     """Manages all animations and frame cycling for TuxTray."""
     
     # Signal emitted when animation frame changes
-    frame_changed = Signal(QPixmap)
+    frame_changed = Signal(QIcon)
     
-    def __init__(self, config_manager: ConfigManager, parent=None):
-        """Initialize the animation engine."""
+    def __init__(self, config_manager: ConfigManager, parent=None, max_cached_animations: int = 3):
+        """
+        Initialize the animation engine.
+        
+        Args:
+            config_manager: Application configuration
+            parent: Parent QObject
+            max_cached_animations: Number of animations whose frames are kept in memory
+        """
         super().__init__(parent)
         
         self.config = config_manager
-        self.animations: Dict[str, Dict[str, Animation]] = {}  # skin -> animation -> Animation
+        self.skins: Dict[str, Dict[str, Dict[str, Any]]] = {}  # skin -> animation -> animation config
+        # (skin, animation) -> Animation, least recently used first
+        self.animations: "OrderedDict[Tuple[str, str], Animation]" = OrderedDict()
+        self.max_cached_animations = max(1, max_cached_animations)
+        self._failed_skins: Set[str] = set()  # skins that failed to load, skipped until reloaded
+        # (skin, animation) -> directory mtime when it yielded no frames, retried once it changes
+        self._empty_animations: Dict[Tuple[str, str], Optional[int]] = {}
         self.current_skin = ""
         self.current_animation_name = "idle"
         self.current_animation: Optional[Animation] = None
         
-        # Animation timer
+        # Animation timer, fires once per frame of the current animation
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self._update_frame)
-        self.timer.setInterval(16)  # ~60 FPS update rate
+        self.timer.setInterval(42)  # ~24fps until an animation is set
+        self._running = False
+        self._paused = False
+        self._last_emitted_index = -1
         
         # Load initial skin
         self._load_skin(self.config.current_skin)
@@ -91,8 +183,126 @@ class AnimationEngine(QObject):
         """Get the path to the assets directory."""
         return Path(__file__).parent.parent / "assets"
     
+    def _get_frame_cache_path(self, animation_path: Path) -> Optional[Path]:
+        """
+        Get the directory holding pre-scaled frames for one animation.
+        
+        Each animation directory gets its own cache directory, so stale entries
+        can be pruned after a load without touching other animations.
+        
+        Args:
+            animation_path: Source directory of the animation frames
+            
+        Returns:
+            Cache directory path, or None if no writable cache location exists
+        """
+        cache_root = QStandardPaths.writableLocation(
+            QStandardPaths.StandardLocation.GenericCacheLocation
+        )
+        if not cache_root:
+            return None
+        
+        animation_key = hashlib.blake2b(
+            os.path.abspath(animation_path).encode(), digest_size=16
+        ).hexdigest()
+        cache_dir = Path(cache_root) / "tuxtray" / "frames" / animation_key
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            log.warning("Frame cache unavailable: %s", e)
+            return None
+        return cache_dir
+    
+    def _get_cached_frame_file(self, cache_dir: Optional[Path], frame_file: str,
+                               icon_size: int) -> Optional[Path]:
+        """
+        Get the cache file for a scaled frame.
+        
+        The key includes the source modification time, so editing a frame
+        automatically invalidates its cached copy.
+        """
+        if cache_dir is None:
+            return None
+        
+        mtime_ns = os.stat(frame_file).st_mtime_ns
+        key = hashlib.blake2b(
+            f"{os.path.abspath(frame_file)}:{mtime_ns}:{icon_size}".encode(), digest_size=16
+        ).hexdigest()
+        return cache_dir / f"{key}.png"
+    
+    def _decode_frame(self, frame_file: str, cache_dir: Optional[Path],
+                      icon_size: int) -> Tuple[Optional[QImage], Optional[Path]]:
+        """
+        Decode a single frame scaled to the tray icon size.
+        
+        Runs on a worker thread, so it only touches QImage.
+        
+        Args:
+            frame_file: Path to the source PNG frame
+            cache_dir: Directory of pre-scaled frames, or None to skip caching
+            icon_size: Size to scale the icon to
+            
+        Returns:
+            Tuple of (scaled QImage, cache file in use); the image is None if the
+            frame could not be loaded, the cache file None if nothing was cached
+        """
+        try:
+            cache_file = self._get_cached_frame_file(cache_dir, frame_file, icon_size)
+            
+            # Reuse the already-scaled frame from a previous run if available
+            if cache_file is not None and cache_file.exists():
+                cached_image = QImage(str(cache_file))
+                if not cached_image.isNull():
+                    return cached_image, cache_file
+            
+            image = QImage(frame_file)
+            if image.isNull():
+                log.warning("Could not load frame: %s", frame_file)
+                return None, None
+            
+            # Scale to tray icon size while maintaining aspect ratio
+            scaled_image = image.scaled(
+                icon_size, icon_size,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            
+            if cache_file is not None and not scaled_image.save(str(cache_file), "PNG"):
+                cache_file = None
+            
+            return scaled_image, cache_file
+        except Exception as e:
+            log.error("Error loading frame %s: %s", frame_file, e)
+            return None, None
+    
+    def _prune_frame_cache(self, cache_dir: Path, keep: Set[str]) -> None:
+        """
+        Delete cached frames the animation no longer uses.
+        
+        Entries are keyed on source path, mtime and icon size, so re-extracted
+        frames or a new tray_icon_size would otherwise leave old copies behind.
+        
+        Args:
+            cache_dir: The animation's cache directory
+            keep: Names of the cache files used by the current load
+        """
+        try:
+            with os.scandir(cache_dir) as entries:
+                stale = [entry.path for entry in entries if entry.name not in keep]
+        except OSError:
+            return
+        
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        
+        if stale:
+            log.debug("Pruned %d stale cached frames from %s", len(stale), cache_dir)
+    
     def _load_animation_frames(self, skin_path: Path, animation_name: str, 
-                             icon_size: int = 32) -> List[QPixmap]:
+                             icon_size: int = 32) -> List[QImage]:
         """
         Load animation frames from disk.
         
@@ -102,41 +312,41 @@ class AnimationEngine(QObject):
             icon_size: Size to scale the icons to
             
         Returns:
-            List of QPixmap frames
+            List of decoded frames
         """
         animation_path = skin_path / animation_name
         frames = []
         
         if not animation_path.exists():
-            print(f"Warning: Animation path not found: {animation_path}")
+            log.warning("Animation path not found: %s", animation_path)
             return frames
         
-        # Get all PNG files and sort them
-        frame_files = sorted([f for f in animation_path.iterdir() 
-                            if f.suffix.lower() == '.png'])
+        # Get all PNG files and sort them; DirEntry names need no stat
+        with os.scandir(animation_path) as entries:
+            frame_files = sorted(entry.path for entry in entries
+                                 if entry.name.lower().endswith('.png'))
         
-        for frame_file in frame_files:
-            try:
-                pixmap = QPixmap(str(frame_file))
-                if not pixmap.isNull():
-                    # Scale to tray icon size while maintaining aspect ratio
-                    scaled_pixmap = pixmap.scaled(
-                        icon_size, icon_size,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    frames.append(scaled_pixmap)
-                else:
-                    print(f"Warning: Could not load frame: {frame_file}")
-            except Exception as e:
-                print(f"Error loading frame {frame_file}: {e}")
-        
-        print(f"Loaded {len(frames)} frames for {skin_path.name}/{animation_name}")
+        cache_dir = self._get_frame_cache_path(animation_path)
+        
+        # Decode and scale frames in parallel; QImage (unlike QPixmap) is safe off the GUI thread
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(
+                lambda frame_file: self._decode_frame(frame_file, cache_dir, icon_size),
+                frame_files
+            ))
+        
+        frames = [image for image, _ in results if image is not None]
+        
+        if cache_dir is not None:
+            self._prune_frame_cache(cache_dir, {cache_file.name for _, cache_file in results
+                                                if cache_file is not None})
+        
+        log.debug("Loaded %d frames for %s/%s", len(frames), skin_path.name, animation_name)
         return frames
     
     def _load_skin(self, skin_name: str) -> bool:
         """
-        Load all animations for a specific skin.
+        Read the animation manifest for a skin; frames are loaded on first use.
         
         Args:
             skin_name: Name of the skin to load
@@ -147,38 +357,85 @@ class AnimationEngine(QObject):
         skin_path = self._get_assets_path() / "skins" / skin_name
         
         if not skin_path.exists():
-            print(f"Warning: Skin path not found: {skin_path}")
+            log.warning("Skin path not found: %s", skin_path)
+            self._failed_skins.add(skin_name)
             return False
         
         skin_info = self.config.get_skin_info(skin_name)
         if not skin_info:
-            print(f"Warning: No config found for skin: {skin_name}")
+            log.warning("No config found for skin: %s", skin_name)
+            self._failed_skins.add(skin_name)
             return False
         
-        animations = {}
-        icon_size = self.config.tray_icon_size
-        
-        # Load each animation type
+        manifest = {}
         for anim_name, anim_config in skin_info.get("animations", {}).items():
-            frames = self._load_animation_frames(skin_path, anim_name, icon_size)
-            
-            if frames:
-                fps = anim_config.get("fps", 24)
-                loop = anim_config.get("loop", True)
-                
-                animation = Animation(anim_name, frames, fps, loop)
-                animations[anim_name] = animation
+            if (skin_path / anim_name).is_dir():
+                manifest[anim_name] = anim_config
             else:
-                print(f"Warning: No frames loaded for {skin_name}/{anim_name}")
+                log.warning("Animation path not found: %s", skin_path / anim_name)
         
-        if animations:
-            self.animations[skin_name] = animations
+        if manifest:
+            self.skins[skin_name] = manifest
             self.current_skin = skin_name
-            print(f"Successfully loaded skin: {skin_name} with {len(animations)} animations")
+            log.info("Successfully loaded skin: %s with %d animations", skin_name, len(manifest))
             return True
         
+        self._failed_skins.add(skin_name)
         return False
     
+    def _ensure_loaded(self, skin_name: str, animation_name: str) -> Optional[Animation]:
+        """
+        Get an animation, loading its frames if they are not cached.
+        
+        Args:
+            skin_name: Skin the animation belongs to
+            animation_name: Name of the animation
+            
+        Returns:
+            The loaded Animation, or None if it has no frames
+        """
+        key = (skin_name, animation_name)
+        animation = self.animations.get(key)
+        
+        if animation is None:
+            manifest = self.skins.get(skin_name, {})
+            anim_config = manifest.get(animation_name)
+            if anim_config is None:
+                return None
+            
+            skin_path = self._get_assets_path() / "skins" / skin_name
+            # Don't rescan a directory that had no frames on every state change;
+            # adding or removing frames changes its mtime and triggers a retry
+            try:
+                mtime_ns = (skin_path / animation_name).stat().st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if key in self._empty_animations and self._empty_animations[key] == mtime_ns:
+                return None
+            
+            frames = self._load_animation_frames(skin_path, animation_name,
+                                                 self.config.tray_icon_size)
+            if not frames:
+                log.warning("No frames loaded for %s/%s", skin_name, animation_name)
+                self._empty_animations[key] = mtime_ns
+                return None
+            
+            self._empty_animations.pop(key, None)
+            
+            fps = anim_config.get("fps", 24)
+            loop = anim_config.get("loop", True)
+            animation = Animation(animation_name, frames, fps, loop)
+            self.animations[key] = animation
+        
+        self.animations.move_to_end(key)
+        
+        while len(self.animations) > self.max_cached_animations:
+            _, evicted = self.animations.popitem(last=False)
+            # Drop the pixmaps now rather than whenever the Animation object dies
+            evicted.release()
+        
+        return animation
+    
     def set_skin(self, skin_name: str) -> bool:
         """
         Change the current skin.
@@ -189,8 +446,8 @@ class AnimationEngine(QObject):
         Returns:
             True if skin was changed successfully
         """
-        if skin_name not in self.animations:
-            if not self._load_skin(skin_name):
+        if skin_name not in self.skins:
+            if skin_name in self._failed_skins or not self._load_skin(skin_name):
                 return False
         
         self.current_skin = skin_name
@@ -210,24 +467,36 @@ class AnimationEngine(QObject):
         Returns:
             True if animation was changed successfully
         """
-        if self.current_skin not in self.animations:
+        if self.current_skin not in self.skins:
             return False
         
-        skin_animations = self.animations[self.current_skin]
+        new_animation = self._ensure_loaded(self.current_skin, animation_name)
         
-        if animation_name in skin_animations:
+        if new_animation:
             # Reset the new animation
-            new_animation = skin_animations[animation_name]
             new_animation.reset()
             
+            # Only the playing animation keeps full-depth icons; others shrink back to their atlas
+            previous = self.current_animation
+            if previous is not None and previous is not new_animation:
+                previous.drop_icons()
+            
             self.current_animation = new_animation
             self.current_animation_name = animation_name
+            self.timer.setInterval(new_animation.frame_duration_ms)
             
             # Emit the first frame
-            self.frame_changed.emit(new_animation.get_current_frame())
+            self.frame_changed.emit(new_animation.get_current_icon())
+            self._last_emitted_index = new_animation.current_frame
+            
+            # A single-frame animation never changes, so it needs no timer
+            if not self._is_animated():
+                self.timer.stop()
+            elif self._running and not self._paused and not self.timer.isActive():
+                self.timer.start()
             return True
         
-        print(f"Warning: Animation '{animation_name}' not found in skin '{self.current_skin}'")
+        log.warning("Animation '%s' not found in skin '%s'", animation_name, self.current_skin)
         return False
     
     def start(self) -> None:
@@ -239,20 +508,43 @@ class AnimationEngine(QObject):
                 if not (self.set_animation("calm") or 
                         self.set_animation("active") or
                         self.set_animation("idle")):
-                    print("Warning: No animations available")
+                    log.warning("No animations available")
             
-            self.timer.start()
+            self._running = True
+            if self._is_animated():
+                self.timer.start()
     
     def stop(self) -> None:
         """Stop the animation timer."""
+        self._running = False
+        self._paused = False
         self.timer.stop()
     
+    def pause(self) -> None:
+        """Pause frame updates (e.g. while the screen is locked) if running."""
+        if self._running and not self._paused:
+            self.timer.stop()
+            self._paused = True
+    
+    def resume(self) -> None:
+        """Resume frame updates stopped by pause()."""
+        if self._paused:
+            self._paused = False
+            if self._is_animated():
+                self.timer.start()
+    
+    def _is_animated(self) -> bool:
+        """Whether the current animation has more than one frame to cycle through."""
+        return self.current_animation is None or self.current_animation.frame_count > 1
+    
     def _update_frame(self) -> None:
         """Internal method called by timer to update animation frames."""
-        if self.current_animation:
-            if self.current_animation.advance_frame():
-                # Emit signal when frame changes
-                self.frame_changed.emit(self.current_animation.get_current_frame())
+        animation = self.current_animation
+        if animation and animation.advance_frame():
+            # Emit signal only when the visible frame actually changes
+            if animation.current_frame != self._last_emitted_index:
+                self._last_emitted_index = animation.current_frame
+                self.frame_changed.emit(animation.get_current_icon())
     
     def get_current_frame(self) -> QPixmap:
         """Get the current animation frame."""
@@ -260,17 +552,23 @@ class AnimationEngine(QObject):
             return self.current_animation.get_current_frame()
         return QPixmap()
     
+    def get_current_icon(self) -> QIcon:
+        """Get the current animation frame as a tray icon."""
+        if self.current_animation:
+            return self.current_animation.get_current_icon()
+        return QIcon()
+    
     def get_available_skins(self) -> List[str]:
         """Get list of available skins."""
-        return list(self.animations.keys())
+        return list(self.skins.keys())
     
     def get_available_animations(self, skin_name: Optional[str] = None) -> List[str]:
         """Get list of available animations for a skin."""
         if skin_name is None:
             skin_name = self.current_skin
         
-        if skin_name in self.animations:
-            return list(self.animations[skin_name].keys())
+        if skin_name in self.skins:
+            return list(self.skins[skin_name].keys())
         return []
     
     def reload_skin(self, skin_name: Optional[str] = None) -> bool:
@@ -287,8 +585,12 @@ class AnimationEngine(QObject):
             skin_name = self.current_skin
         
         # Remove from cache
-        if skin_name in self.animations:
-            del self.animations[skin_name]
+        self._failed_skins.discard(skin_name)
+        self.skins.pop(skin_name, None)
+        for key in [key for key in self.animations if key[0] == skin_name]:
+            del self.animations[key]
+        for key in [key for key in self._empty_animations if key[0] == skin_name]:
+            del self._empty_animations[key]
         
         # Reload
         return self._load_skin(skin_name)
@@ -305,8 +607,9 @@ def main():
     config = ConfigManager()
     engine = AnimationEngine(config)
     
-    def on_frame_change(pixmap):
-        print(f"Frame changed: {pixmap.size().width()}x{pixmap.size().height()}")
+    def on_frame_change(icon):
+        size = icon.actualSize(QSize(config.tray_icon_size, config.tray_icon_size))
+        print(f"Frame changed: {size.width()}x{size.height()}")
     
     engine.frame_changed.connect(on_frame_change)
     
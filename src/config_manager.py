@@ -3,10 +3,130 @@ Configuration Manager for TuxTray
 Handles loading and saving of application settings and skin configurations.
 """
 
+import atexit
+import copy
 import json
+import logging
 import os
+import pickle
+import threading
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Settings:
+    """Flat copy of the "settings" section for cheap attribute access."""
+    poll_interval_ms: int = 500
+    battery_poll_interval_ms: int = 1500
+    animation_mode: str = "cpu"
+    current_skin: str = "default"
+    tray_icon_size: int = 32
+    emotion_system_enabled: bool = True
+
+
+SETTING_FIELDS = frozenset(setting.name for setting in fields(Settings))
+
+
+@dataclass(slots=True, frozen=True)
+class EmotionThresholds:
+    """Emotion thresholds resolved to plain numbers for the per-poll classifier."""
+    cpu_critical: float = 90
+    ram_critical: float = 90
+    network_critical_kbps: float = 2000
+    any_critical_threshold: float = 85
+    cpu_high: float = 70
+    ram_high: float = 75
+    network_high_kbps: float = 800
+    single_resource_threshold: float = 60
+    calm_cpu_max: float = 20
+    calm_ram_max: float = 30
+    calm_network_max_kbps: float = 50
+    descriptions: Dict[str, str] = field(default_factory=dict)
+    # Derived cutoffs: any_critical folded into the per-resource limits, busy network pre-scaled
+    cpu_overload: float = field(init=False, repr=False, compare=False)
+    ram_overload: float = field(init=False, repr=False, compare=False)
+    network_busy_kbps: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'cpu_overload', min(self.cpu_critical, self.any_critical_threshold))
+        object.__setattr__(self, 'ram_overload', min(self.ram_critical, self.any_critical_threshold))
+        object.__setattr__(self, 'network_busy_kbps', self.single_resource_threshold * 10)
+    
+    @classmethod
+    def from_dict(cls, emotion_thresholds: Dict[str, Dict[str, Any]]) -> "EmotionThresholds":
+        """
+        Build thresholds from the "emotion_thresholds" config section.
+        
+        Args:
+            emotion_thresholds: Mapping of emotion name to its threshold settings
+            
+        Returns:
+            EmotionThresholds with defaults filled in for missing keys
+        """
+        overload_config = emotion_thresholds.get('overloaded', {})
+        stressed_config = emotion_thresholds.get('stressed', {})
+        busy_config = emotion_thresholds.get('busy', {})
+        calm_config = emotion_thresholds.get('calm', {})
+        
+        return cls(
+            cpu_critical=overload_config.get('cpu_critical', 90),
+            ram_critical=overload_config.get('ram_critical', 90),
+            network_critical_kbps=overload_config.get('network_critical_kbps', 2000),
+            any_critical_threshold=overload_config.get('any_critical_threshold', 85),
+            cpu_high=stressed_config.get('cpu_high', 70),
+            ram_high=stressed_config.get('ram_high', 75),
+            network_high_kbps=stressed_config.get('network_high_kbps', 800),
+            single_resource_threshold=busy_config.get('single_resource_threshold', 60),
+            calm_cpu_max=calm_config.get('cpu_max', 20),
+            calm_ram_max=calm_config.get('ram_max', 30),
+            calm_network_max_kbps=calm_config.get('network_max_kbps', 50),
+            descriptions={
+                emotion: config['description']
+                for emotion, config in emotion_thresholds.items()
+                if isinstance(config, dict) and 'description' in config
+            },
+        )
+
+# Used when config.json is missing or unreadable; copied before use since callers mutate it
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "skins": {},
+    "thresholds": {
+        "cpu": {"idle": 30, "walk": 80},
+        "ram": {"idle": 40, "walk": 85},
+        "network": {"idle_kbps": 100, "walk_kbps": 1000}
+    },
+    "emotion_thresholds": {
+        "calm": {"cpu_max": 20, "ram_max": 30, "network_max_kbps": 50},
+        "active": {"cpu_range": [20, 60], "ram_range": [30, 70], "network_range_kbps": [50, 500]},
+        "busy": {"single_resource_threshold": 60},
+        "stressed": {"multiple_resources_threshold": 70, "cpu_high": 70, "ram_high": 75, "network_high_kbps": 800},
+        "overloaded": {"cpu_critical": 90, "ram_critical": 90, "network_critical_kbps": 2000, "any_critical_threshold": 85}
+    },
+    "settings": {
+        "poll_interval_ms": 500,
+        "battery_poll_interval_ms": 1500,
+        "animation_mode": "emotion",
+        "current_skin": "default",
+        "tray_icon_size": 32,
+        "emotion_system_enabled": True
+    }
+}
+
+# Delay before a scheduled save runs, so a burst of changes is written once
+SAVE_DEBOUNCE_SECONDS = 2.0
+
+# Pickled (cache key, config) per config path, so later ConfigManagers in the
+# same process skip the cache file read; unpickling also gives each a fresh copy
+_parsed_config_blobs: Dict[Path, bytes] = {}
 
 
 class ConfigManager:
@@ -21,61 +141,157 @@ class ConfigManager:
             self.config_path = Path(config_path)
         
         self.config = self._load_config()
+        self.settings = self._build_settings()
+        
+        # _save_lock guards self.config and the timer; _write_lock only orders file writes
+        self._save_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._flush_registered = False
+        self._snapshot_generation = 0
+        self._written_generation = 0
+        self._setting_listeners: List[Callable[[str, Any], None]] = []
+        self._emotion_threshold_values: Optional[EmotionThresholds] = None
+    
+    def add_setting_listener(self, callback: Callable[[str, Any], None]) -> None:
+        """
+        Register a callback invoked as callback(key, value) whenever a setting changes.
+        
+        Lets callers cache derived values instead of re-reading the config on every use.
+        """
+        self._setting_listeners.append(callback)
+    
+    def _notify_setting_changed(self, key: str, value: Any) -> None:
+        """Call every registered setting listener."""
+        for callback in self._setting_listeners:
+            callback(key, value)
+    
+    def _get_parsed_cache_path(self) -> Path:
+        """Get the path of the pickled copy of the parsed config."""
+        return self.config_path.with_name(self.config_path.name + ".pkl")
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from JSON file."""
+        """Load configuration from JSON file, reusing the last parse if the file is unchanged."""
         try:
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            stat = self.config_path.stat()
+            cache_key = (stat.st_mtime_ns, stat.st_size)
+            
+            cached = self._load_parsed_cache(cache_key)
+            if cached is not None:
+                return cached
+            
+            data = self.config_path.read_bytes()
+            config = orjson.loads(data) if orjson else json.loads(data)
         except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Warning: Could not load config from {self.config_path}: {e}")
+            log.warning("Could not load config from %s: %s", self.config_path, e)
             return self._get_default_config()
+        
+        self._save_parsed_cache(cache_key, config)
+        return config
+    
+    def _load_parsed_cache(self, cache_key: tuple) -> Optional[Dict[str, Any]]:
+        """Return the cached parse if it was made from the same config file version."""
+        blob = _parsed_config_blobs.get(self.config_path)
+        try:
+            if blob is None:
+                blob = self._get_parsed_cache_path().read_bytes()
+            key, config = pickle.loads(blob)
+        except Exception:
+            return None
+        
+        if key != cache_key:
+            return None
+        
+        _parsed_config_blobs[self.config_path] = blob
+        return config
+    
+    def _save_parsed_cache(self, cache_key: tuple, config: Dict[str, Any]) -> None:
+        """Store the parsed config next to the JSON file; a read-only location is fine."""
+        blob = pickle.dumps((cache_key, config), protocol=pickle.HIGHEST_PROTOCOL)
+        _parsed_config_blobs[self.config_path] = blob
+        try:
+            self._get_parsed_cache_path().write_bytes(blob)
+        except OSError:
+            pass
+    
+    def _build_settings(self) -> Settings:
+        """Build the settings struct from the loaded config, ignoring unknown keys."""
+        settings = self.config.get("settings", {})
+        return Settings(**{key: value for key, value in settings.items() if key in SETTING_FIELDS})
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Return default configuration if config file is missing."""
-        return {
-            "skins": {},
-            "thresholds": {
-                "cpu": {"idle": 30, "walk": 80},
-                "ram": {"idle": 40, "walk": 85},
-                "network": {"idle_kbps": 100, "walk_kbps": 1000}
-            },
-            "emotion_thresholds": {
-                "calm": {"cpu_max": 20, "ram_max": 30, "network_max_kbps": 50},
-                "active": {"cpu_range": [20, 60], "ram_range": [30, 70], "network_range_kbps": [50, 500]},
-                "busy": {"single_resource_threshold": 60},
-                "stressed": {"multiple_resources_threshold": 70, "cpu_high": 70, "ram_high": 75, "network_high_kbps": 800},
-                "overloaded": {"cpu_critical": 90, "ram_critical": 90, "network_critical_kbps": 2000, "any_critical_threshold": 85}
-            },
-            "settings": {
-                "poll_interval_ms": 500,
-                "animation_mode": "emotion",
-                "current_skin": "default",
-                "tray_icon_size": 32,
-                "emotion_system_enabled": True
-            }
-        }
+        return copy.deepcopy(DEFAULT_CONFIG)
+    
+    def schedule_save(self) -> None:
+        """Save the configuration on a background thread once changes settle."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            
+            # The timer is a daemon thread, so write any save still pending at exit
+            if not self._flush_registered:
+                atexit.register(self._flush_pending_save)
+                self._flush_registered = True
+            
+            self._save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self.save_config)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush_pending_save(self) -> None:
+        """Run a scheduled save immediately if one has not happened yet."""
+        if self._save_timer is not None:
+            self.save_config()
     
     def save_config(self) -> bool:
-        """Save current configuration to file."""
-        try:
-            os.makedirs(self.config_path.parent, exist_ok=True)
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=4)
-            return True
-        except Exception as e:
-            print(f"Error saving config: {e}")
-            return False
+        """Save current configuration to file now, replacing any scheduled save."""
+        # Snapshot under the lock and write outside it, so setters never wait on the disk
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            
+            snapshot = copy.deepcopy(self.config)
+            self._snapshot_generation += 1
+            generation = self._snapshot_generation
+        
+        with self._write_lock:
+            if generation < self._written_generation:
+                # A newer snapshot already reached the disk
+                return True
+            
+            tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+            try:
+                os.makedirs(self.config_path.parent, exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    json.dump(snapshot, f, indent=4)
+                # Atomic on POSIX and Windows, so a crash never leaves a truncated config
+                os.replace(tmp_path, self.config_path)
+                self._written_generation = generation
+                return True
+            except Exception as e:
+                log.error("Error saving config: %s", e)
+                return False
     
     def get_setting(self, key: str, default: Any = None) -> Any:
-        """Get a setting value."""
+        """Get a setting value, falling back to the built-in default for the key."""
+        if default is None:
+            default = DEFAULT_CONFIG["settings"].get(key)
         return self.config.get("settings", {}).get(key, default)
     
     def set_setting(self, key: str, value: Any) -> None:
-        """Set a setting value."""
-        if "settings" not in self.config:
-            self.config["settings"] = {}
-        self.config["settings"][key] = value
+        """Set a setting value and schedule a save."""
+        # Hold the save lock so a save never snapshots a dict mid-update
+        with self._save_lock:
+            if "settings" not in self.config:
+                self.config["settings"] = {}
+            self.config["settings"][key] = value
+        
+        if key in SETTING_FIELDS:
+            setattr(self.settings, key, value)
+        
+        self.schedule_save()
+        self._notify_setting_changed(key, value)
     
     def get_skin_info(self, skin_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific skin."""
@@ -102,7 +318,7 @@ class ConfigManager:
     @property
     def current_skin(self) -> str:
         """Get the currently selected skin."""
-        return self.get_setting("current_skin", "default")
+        return self.settings.current_skin
     
     @current_skin.setter
     def current_skin(self, skin_name: str) -> None:
@@ -112,7 +328,7 @@ class ConfigManager:
     @property
     def animation_mode(self) -> str:
         """Get the current animation mode."""
-        return self.get_setting("animation_mode", "cpu")
+        return self.settings.animation_mode
     
     @animation_mode.setter
     def animation_mode(self, mode: str) -> None:
@@ -123,25 +339,41 @@ class ConfigManager:
     @property
     def poll_interval(self) -> int:
         """Get the polling interval in milliseconds."""
-        return self.get_setting("poll_interval_ms", 500)
+        return self.settings.poll_interval_ms
+    
+    @property
+    def battery_poll_interval(self) -> int:
+        """Get the polling interval in milliseconds used while on battery power."""
+        return self.settings.battery_poll_interval_ms
     
     @property
     def tray_icon_size(self) -> int:
         """Get the tray icon size."""
-        return self.get_setting("tray_icon_size", 32)
+        return self.settings.tray_icon_size
     
     def get_emotion_thresholds(self) -> Dict[str, Dict[str, Any]]:
         """Get emotion-based thresholds."""
         return self.config.get("emotion_thresholds", {})
     
+    def get_emotion_threshold_values(self) -> EmotionThresholds:
+        """Get emotion thresholds as an EmotionThresholds, converted once and cached."""
+        if self._emotion_threshold_values is None:
+            self._emotion_threshold_values = EmotionThresholds.from_dict(self.get_emotion_thresholds())
+        return self._emotion_threshold_values
+    
     def set_emotion_thresholds(self, thresholds: Dict[str, Dict[str, Any]]) -> None:
         """Set emotion-based thresholds."""
-        self.config["emotion_thresholds"] = thresholds
+        with self._save_lock:
+            self.config["emotion_thresholds"] = thresholds
+            self._emotion_threshold_values = None
+        
+        self.schedule_save()
+        self._notify_setting_changed("emotion_thresholds", thresholds)
     
     @property
     def emotion_system_enabled(self) -> bool:
         """Check if emotion system is enabled."""
-        return self.get_setting("emotion_system_enabled", True)
+        return self.settings.emotion_system_enabled
     
     @emotion_system_enabled.setter
     def emotion_system_enabled(self, enabled: bool) -> None:
@@ -10,16 +10,25 @@ Author: Aravind Lal
 License: MIT
 """
 
+import logging
 import sys
 import signal
+import socket
+from typing import Any, Optional
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer, QObject, Signal, Slot
+from PySide6.QtCore import QTimer, QObject, QSocketNotifier, Signal, Slot, SLOT
 
-from .config_manager import ConfigManager
-from .system_monitor import SystemMonitor, SystemStats
+from .config_manager import ConfigManager, EmotionThresholds
+from .system_monitor import EmotionAnalysis, SystemMonitor, SystemStats
 from .animation_engine import AnimationEngine
 from .tray_manager import TrayManager
 
+# Monitoring modes that read network usage; others skip sampling it
+NETWORK_MODES = ("network", "emotion")
+
+# How often to check whether the machine switched between AC and battery power
+POWER_CHECK_INTERVAL_MS = 30_000
+
 
 class TuxTrayApp(QObject):
     """Main application class for TuxTray."""
@@ -30,14 +39,27 @@ class TuxTrayApp(QObject):
         
         # Initialize core components
         self.config_manager = ConfigManager()
-        self.system_monitor = SystemMonitor()
+        self.system_monitor = SystemMonitor(
+            needs_network=self.config_manager.animation_mode in NETWORK_MODES
+        )
         self.animation_engine = AnimationEngine(self.config_manager)
         self.tray_manager = TrayManager(self.config_manager, self.animation_engine)
         
         # System stats polling timer
         self.poll_timer = QTimer(self)
-        self.poll_timer.setInterval(self.config_manager.poll_interval)
         self.poll_timer.timeout.connect(self.update_system_stats)
+        self._polling_paused = False
+        
+        # Poll less often on battery; power state is rechecked periodically
+        self.power_timer = QTimer(self)
+        self.power_timer.setInterval(POWER_CHECK_INTERVAL_MS)
+        self.power_timer.timeout.connect(self._update_poll_interval)
+        self._update_poll_interval()
+        
+        # Classification inputs, refreshed only when the config changes
+        self._last_tooltip_text = None
+        self._refresh_thresholds()
+        self.config_manager.add_setting_listener(self._handle_setting_change)
         
         # Connect signals
         self._connect_signals()
@@ -49,6 +71,26 @@ class TuxTrayApp(QObject):
             self._handle_animation_mode_change
         )
         self.tray_manager.skin_changed.connect(self._handle_skin_change)
+        self._connect_screensaver()
+    
+    def _connect_screensaver(self):
+        """Listen for screen lock changes so no work is done while nobody can see the tray."""
+        if sys.platform != "linux":
+            return
+        
+        try:
+            from PySide6.QtDBus import QDBusConnection
+        except ImportError:
+            return
+        
+        bus = QDBusConnection.sessionBus()
+        if not bus.isConnected():
+            return
+        
+        bus.connect(
+            "", "/org/freedesktop/ScreenSaver", "org.freedesktop.ScreenSaver",
+            "ActiveChanged", self, SLOT("_handle_screensaver_change(bool)")
+        )
     
     def start(self):
         """Start the application."""
@@ -61,6 +103,7 @@ class TuxTrayApp(QObject):
         # Start animation and monitoring
         self.animation_engine.start()
         self.poll_timer.start()
+        self.power_timer.start()
         
         # Initial update
         self.update_system_stats()
@@ -72,37 +115,60 @@ class TuxTrayApp(QObject):
         )
         print("TuxTray is now running in the system tray.")
     
-    @Slot()
-    def update_system_stats(self):
-        """Poll system stats and update animation."""
-        stats = self.system_monitor.get_system_stats()
+    def _refresh_thresholds(self):
+        """Cache the monitoring mode and its thresholds for the poll loop."""
+        self._mode = self.config_manager.animation_mode
         
-        # Determine new animation state
-        mode = self.config_manager.animation_mode
-        
-        if mode == "emotion" and self.config_manager.emotion_system_enabled:
-            # Use emotion system
-            emotion_thresholds = self.config_manager.get_emotion_thresholds()
-            new_state = self.system_monitor.determine_emotion_state(stats, emotion_thresholds)
+        if self._mode == "emotion":
+            # Use emotion system; built-in thresholds when it is disabled in the config
+            if self.config_manager.emotion_system_enabled:
+                self._thresholds = self.config_manager.get_emotion_threshold_values()
+            else:
+                self._thresholds = EmotionThresholds()
         else:
             # Use legacy system
-            thresholds = self.config_manager.get_thresholds(mode)
-            new_state = self.system_monitor.determine_animation_state(stats, mode, thresholds)
+            self._thresholds = self.config_manager.get_thresholds(self._mode)
+        
+        self.system_monitor.set_needs_network(self._mode in NETWORK_MODES)
+        self._last_tooltip_text = None
+    
+    def _handle_setting_change(self, key: str, value: Any):
+        """Refresh cached classification inputs when a relevant setting changes."""
+        if key in ("animation_mode", "emotion_system_enabled", "emotion_thresholds"):
+            self._refresh_thresholds()
+        elif key in ("poll_interval_ms", "battery_poll_interval_ms"):
+            self._update_poll_interval()
+    
+    @Slot()
+    def _update_poll_interval(self):
+        """Pick the poll interval for the current power source."""
+        if self.system_monitor.is_on_battery():
+            interval = self.config_manager.battery_poll_interval
+        else:
+            interval = self.config_manager.poll_interval
+        
+        # setInterval restarts an active timer, so only call it on an actual change
+        if interval != self.poll_timer.interval():
+            self.poll_timer.setInterval(interval)
+    
+    @Slot()
+    def update_system_stats(self):
+        """Poll system stats and update animation."""
+        mode = self._mode
+        stats, new_state, analysis = self.system_monitor.poll_and_classify(mode, self._thresholds)
         
         # Update animation if state changed
         if new_state != self.animation_engine.current_animation_name:
             self.animation_engine.set_animation(new_state)
         
         # Update tooltip
-        self._update_tooltip(stats, mode)
+        self._update_tooltip(stats, mode, analysis)
     
-    def _update_tooltip(self, stats: SystemStats, mode: str):
+    def _update_tooltip(self, stats: SystemStats, mode: str, analysis: Optional[EmotionAnalysis] = None):
         """Update tray icon tooltip with current stats."""
         if mode == "emotion":
             # Show emotion state and overall system health
-            emotion_thresholds = self.config_manager.get_emotion_thresholds()
-            analysis = self.system_monitor.get_emotion_analysis(stats, emotion_thresholds)
-            stats_text = f"Mood: {analysis['emotion'].title()} ({analysis['overall_stress']}% stress)"
+            stats_text = f"Mood: {analysis.emotion.title()} ({analysis.overall_stress}% stress)"
         elif mode == "cpu":
             stats_text = f"CPU: {stats.cpu_percent:.1f}%"
         elif mode == "ram":
@@ -111,8 +177,11 @@ class TuxTrayApp(QObject):
             stats_text = f"Network: {stats.network_kbps:.1f} KB/s"
         else:
             stats_text = "Monitoring..."
-            
-        self.tray_manager.update_tooltip(stats_text)
+        
+        # Skip the tray round-trip when the text hasn't changed
+        if stats_text != self._last_tooltip_text:
+            self._last_tooltip_text = stats_text
+            self.tray_manager.update_tooltip(stats_text)
     
     @Slot(str)
     def _handle_animation_mode_change(self, mode: str):
@@ -121,6 +190,21 @@ class TuxTrayApp(QObject):
         # Force immediate update to reflect new mode
         self.update_system_stats()
     
+    @Slot(bool)
+    def _handle_screensaver_change(self, active: bool):
+        """Pause animation and polling while the screen is locked."""
+        if active:
+            self.animation_engine.pause()
+            if self.poll_timer.isActive():
+                self.poll_timer.stop()
+                self._polling_paused = True
+        else:
+            self.animation_engine.resume()
+            if self._polling_paused:
+                self._polling_paused = False
+                self.poll_timer.start()
+                self.update_system_stats()
+    
     @Slot(str)
     def _handle_skin_change(self, skin_name: str):
         """Handle changes to the penguin skin."""
@@ -133,6 +217,7 @@ class TuxTrayApp(QObject):
         
         self.animation_engine.stop()
         self.poll_timer.stop()
+        self.power_timer.stop()
         self.config_manager.save_config()
         
         QApplication.instance().quit()
@@ -145,6 +230,9 @@ def main():
     - Sets up signal handling for graceful exit
     - Starts the main application logic
     """
+    # Diagnostics go through logging; only warnings and errors are shown by default
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    
     # Platform-specific initialization
     if sys.platform == "linux":
         try:
@@ -186,11 +274,16 @@ def main():
     signal.signal(signal.SIGINT, sigint_handler)
     signal.signal(signal.SIGTERM, sigint_handler)
     
-    # Use a timer to ensure signals are processed by the Python interpreter
-    # This is required for SIGINT to work with Qt applications
-    timer = QTimer()
-    timer.start(500)
-    timer.timeout.connect(lambda: None) # Let the interpreter run
+    # Python only runs signal handlers when the interpreter gets control, which
+    # doesn't happen while Qt sits in its event loop. Have Python write a byte to a
+    # socket on each signal and wake Qt through a notifier on the other end.
+    wakeup_reader, wakeup_writer = socket.socketpair()
+    wakeup_reader.setblocking(False)
+    wakeup_writer.setblocking(False)
+    signal.set_wakeup_fd(wakeup_writer.fileno())
+    
+    signal_notifier = QSocketNotifier(wakeup_reader.fileno(), QSocketNotifier.Read)
+    signal_notifier.activated.connect(lambda: wakeup_reader.recv(64))
     
     # Start the application
     tuxtray_app.start()
@@ -3,44 +3,180 @@ System Monitor for TuxTray
 Monitors system resources (CPU, RAM, Network) using psutil.
 """
 
+import asyncio
+import logging
+from operator import attrgetter
 import psutil
 import time
-from typing import Dict, Tuple, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Tuple, Optional, Union
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    from .config_manager import EmotionThresholds
 
-@dataclass
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class SystemStats:
     """Container for system statistics."""
     cpu_percent: float
     ram_percent: float
     network_kbps: float
-    timestamp: float
+    timestamp: float  # time.monotonic() seconds
+
+
+@dataclass(slots=True)
+class EmotionAnalysis:
+    """Emotion state and stress breakdown for one sample."""
+    emotion: str
+    overall_stress: float  # 0-100, mean of the per-resource levels
+    cpu_stress: float
+    ram_stress: float
+    network_stress: float
+    stressor_mask: int  # see stressor_mask()
+    description: str
+    active_stressors: Tuple[str, ...] = ()  # only filled in detailed analyses
+
+
+# Emotion states, indexed by the value returned from _classify_emotion
+EMOTION_STATES = ("calm", "active", "busy", "stressed", "overloaded")
+
+
+# Legacy modes: (usage getter, idle key, idle default, walk key, walk default)
+LEGACY_MODES: Dict[str, Tuple[Callable[[SystemStats], float], str, float, str, float]] = {
+    "cpu": (attrgetter("cpu_percent"), "idle", 30, "walk", 80),
+    "ram": (attrgetter("ram_percent"), "idle", 40, "walk", 85),
+    "network": (attrgetter("network_kbps"), "idle_kbps", 100, "walk_kbps", 1000),
+}
+
+
+def _classify_emotion(cpu: float, ram: float, network: float,
+                      th: "EmotionThresholds") -> int:
+    """
+    Classify resource usage into an emotion state.
+    
+    Args:
+        cpu: CPU usage percentage
+        ram: RAM usage percentage
+        network: Network usage in KB/s
+        th: Emotion thresholds
+        
+    Returns:
+        Index into EMOTION_STATES
+    """
+    # Check for overloaded state first (highest priority)
+    if cpu >= th.cpu_overload or ram >= th.ram_overload or network >= th.network_critical_kbps:
+        return 4
+    
+    # Check for stressed state (multiple resources high)
+    high_resources = (cpu >= th.cpu_high) + (ram >= th.ram_high) + (network >= th.network_high_kbps)
+    if high_resources >= 2:
+        return 3
+    
+    # Check for busy state (single resource high, network scaled)
+    single_threshold = th.single_resource_threshold
+    if cpu >= single_threshold or ram >= single_threshold or network >= th.network_busy_kbps:
+        return 2
+    
+    # Check for calm state (all resources low)
+    if cpu <= th.calm_cpu_max and ram <= th.calm_ram_max and network <= th.calm_network_max_kbps:
+        return 0
+    
+    # Default to active state (normal activity)
+    return 1
+
+
+def _stress_levels(cpu: float, ram: float, network: float) -> Tuple[float, float, float]:
+    """
+    Scale resource usage to 0-100 stress levels.
+    
+    Args:
+        cpu: CPU usage percentage
+        ram: RAM usage percentage
+        network: Network usage in KB/s
+        
+    Returns:
+        Tuple of (cpu, ram, network) stress levels
+    """
+    # Network saturates at 2000 KB/s
+    return (cpu if cpu < 100 else 100,
+            ram if ram < 100 else 100,
+            network / 20 if network < 2000 else 100)
+
+
+# Bits in stressor_mask
+STRESSOR_CPU = 1
+STRESSOR_RAM = 2
+STRESSOR_NETWORK = 4
+
+
+def stressor_mask(stats: SystemStats) -> int:
+    """
+    Flag which resources are causing system stress.
+    
+    Args:
+        stats: Current system statistics
+        
+    Returns:
+        Bitwise OR of STRESSOR_CPU, STRESSOR_RAM and STRESSOR_NETWORK
+    """
+    return ((stats.cpu_percent > 70) * STRESSOR_CPU |
+            (stats.ram_percent > 75) * STRESSOR_RAM |
+            (stats.network_kbps > 800) * STRESSOR_NETWORK)
 
 
 class SystemMonitor:
     """Monitors system resources for TuxTray animation control."""
     
-    def __init__(self):
-        """Initialize the system monitor."""
-        self._last_network_io: Optional[Tuple[int, int]] = None
-        self._last_network_time: Optional[float] = None
+    def __init__(self, needs_network: bool = True):
+        """
+        Initialize the system monitor.
+        
+        Args:
+            needs_network: Whether network usage is sampled; see set_needs_network
+        """
+        # Bind psutil samplers once; they are called on every poll
+        self._cpu_percent = psutil.cpu_percent
+        self._virtual_memory = psutil.virtual_memory
+        self._net_io_counters = psutil.net_io_counters
+        
+        self._last_bytes_sent = 0
+        self._last_bytes_recv = 0
+        self._last_network_time_ns: Optional[int] = None  # None until a baseline exists
         self._cpu_percent_cache = 0.0
+        self._needs_network = needs_network
         
         # Initialize network baseline
-        self._init_network_baseline()
+        if needs_network:
+            self._init_network_baseline()
+    
+    def set_needs_network(self, needs_network: bool) -> None:
+        """
+        Enable or disable network sampling.
+        
+        Reading the network counters costs a /proc read per poll, so modes that
+        don't use network usage can turn it off. Stats then report 0 KB/s.
+        
+        Args:
+            needs_network: Whether get_system_stats should sample network usage
+        """
+        if needs_network and not self._needs_network:
+            # Start from a fresh baseline rather than averaging over the idle gap
+            self._init_network_baseline()
+        self._needs_network = needs_network
     
     def _init_network_baseline(self) -> None:
         """Initialize network monitoring baseline."""
         try:
-            net_io = psutil.net_io_counters()
+            net_io = self._net_io_counters()
             if net_io:
-                self._last_network_io = (net_io.bytes_sent, net_io.bytes_recv)
-                self._last_network_time = time.time()
+                self._last_bytes_sent = net_io.bytes_sent
+                self._last_bytes_recv = net_io.bytes_recv
+                self._last_network_time_ns = time.monotonic_ns()
         except (AttributeError, OSError):
             # Network monitoring not available
-            self._last_network_io = None
-            self._last_network_time = None
+            self._last_network_time_ns = None
     
     def get_cpu_usage(self) -> float:
         """
@@ -49,78 +185,118 @@ class SystemMonitor:
         """
         try:
             # Use non-blocking call with cached value
-            cpu_percent = psutil.cpu_percent(interval=None)
+            cpu_percent = self._cpu_percent(interval=None)
             if cpu_percent > 0:
                 self._cpu_percent_cache = cpu_percent
             return self._cpu_percent_cache
-        except Exception as e:
-            print(f"Error getting CPU usage: {e}")
+        except (psutil.Error, OSError):
+            log.debug("CPU sample failed", exc_info=True)
             return self._cpu_percent_cache
     
     def get_ram_usage(self) -> float:
         """Get current RAM usage as percentage."""
         try:
-            memory = psutil.virtual_memory()
-            return memory.percent
-        except Exception as e:
-            print(f"Error getting RAM usage: {e}")
+            return self._virtual_memory().percent
+        except (psutil.Error, OSError):
+            log.debug("RAM sample failed", exc_info=True)
             return 0.0
     
-    def get_network_usage(self) -> float:
+    def get_network_usage(self, now_ns: Optional[int] = None) -> float:
         """
         Get current network usage in KB/s.
         Returns combined upload + download speed.
+        
+        Args:
+            now_ns: time.monotonic_ns() reading to use, if the caller already has one
         """
         try:
-            net_io = psutil.net_io_counters()
-            current_time = time.time()
+            net_io = self._net_io_counters()
+            current_time_ns = time.monotonic_ns() if now_ns is None else now_ns
             
-            if (net_io is None or 
-                self._last_network_io is None or 
-                self._last_network_time is None):
+            if net_io is None or self._last_network_time_ns is None:
                 return 0.0
             
             # Calculate bytes transferred since last check
-            bytes_sent = net_io.bytes_sent - self._last_network_io[0]
-            bytes_recv = net_io.bytes_recv - self._last_network_io[1]
-            total_bytes = bytes_sent + bytes_recv
+            bytes_sent = net_io.bytes_sent
+            bytes_recv = net_io.bytes_recv
+            total_bytes = (bytes_sent - self._last_bytes_sent) + (bytes_recv - self._last_bytes_recv)
             
             # Calculate time elapsed
-            time_elapsed = current_time - self._last_network_time
+            elapsed_ns = current_time_ns - self._last_network_time_ns
+            if elapsed_ns <= 0:
+                return 0.0
             
             # Update baseline for next calculation
-            self._last_network_io = (net_io.bytes_sent, net_io.bytes_recv)
-            self._last_network_time = current_time
+            self._last_bytes_sent = bytes_sent
+            self._last_bytes_recv = bytes_recv
+            self._last_network_time_ns = current_time_ns
             
-            # Convert to KB/s
-            if time_elapsed > 0:
-                kbps = (total_bytes / 1024) / time_elapsed
-                return max(0, kbps)  # Ensure non-negative
+            # Counters can go backwards when an interface resets
+            if total_bytes <= 0:
+                return 0.0
             
-            return 0.0
+            # Convert to KB/s in integer milli-KB/s, going to float only once
+            milli_kbps = total_bytes * 1_000_000_000_000 // (elapsed_ns * 1024)
+            return milli_kbps / 1000
             
-        except Exception as e:
-            print(f"Error getting network usage: {e}")
+        except (psutil.Error, OSError):
+            log.debug("Network sample failed", exc_info=True)
             return 0.0
     
     def get_system_stats(self) -> SystemStats:
-        """Get all system statistics at once."""
+        """Get all system statistics at once, sharing one clock reading."""
+        now_ns = time.monotonic_ns()
         return SystemStats(
             cpu_percent=self.get_cpu_usage(),
             ram_percent=self.get_ram_usage(),
-            network_kbps=self.get_network_usage(),
-            timestamp=time.time()
+            network_kbps=self.get_network_usage(now_ns) if self._needs_network else 0.0,
+            timestamp=now_ns / 1e9
         )
     
+    def is_on_battery(self) -> bool:
+        """Check whether the machine is running on battery power."""
+        try:
+            battery = psutil.sensors_battery()
+        except (AttributeError, NotImplementedError, OSError):
+            # Battery sensors not available on this platform
+            return False
+        return battery is not None and battery.power_plugged is False
+    
+    async def get_system_stats_async(self) -> SystemStats:
+        """Get all system statistics without blocking the running event loop."""
+        return await asyncio.to_thread(self.get_system_stats)
+    
+    async def run(self, interval: float, on_stats: Callable[[SystemStats], None],
+                  samples: Optional[int] = None) -> None:
+        """
+        Poll system statistics on an asyncio event loop.
+        
+        Args:
+            interval: Seconds between samples
+            on_stats: Called with each new SystemStats
+            samples: Number of samples to take, or None to poll until cancelled
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        taken = 0
+        
+        while samples is None or taken < samples:
+            on_stats(await self.get_system_stats_async())
+            taken += 1
+            
+            # Sleep to the next tick rather than a fixed interval so sampling doesn't drift
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    
     def determine_animation_state(self, stats: SystemStats, mode: str, 
-                                thresholds: Dict[str, int]) -> str:
+                                thresholds: Union[Dict[str, int], "EmotionThresholds"]) -> str:
         """
         Determine which animation to play based on system stats and mode.
         
         Args:
             stats: Current system statistics
             mode: Monitoring mode ('cpu', 'ram', 'network', 'emotion')
-            thresholds: Threshold values for the mode
+            thresholds: Threshold values for the mode (EmotionThresholds in emotion mode)
             
         Returns:
             Animation state: 'idle', 'walk', 'run' (legacy) or emotion state
@@ -129,133 +305,103 @@ class SystemMonitor:
             return self.determine_emotion_state(stats, thresholds)
         
         # Legacy mode support
-        if mode == "cpu":
-            usage = stats.cpu_percent
-            idle_threshold = thresholds.get("idle", 30)
-            walk_threshold = thresholds.get("walk", 80)
-        
-        elif mode == "ram":
-            usage = stats.ram_percent
-            idle_threshold = thresholds.get("idle", 40)
-            walk_threshold = thresholds.get("walk", 85)
-        
-        elif mode == "network":
-            usage = stats.network_kbps
-            idle_threshold = thresholds.get("idle_kbps", 100)
-            walk_threshold = thresholds.get("walk_kbps", 1000)
-        
-        else:
+        spec = LEGACY_MODES.get(mode)
+        if spec is None:
             return "idle"
         
+        get_usage, idle_key, idle_default, walk_key, walk_default = spec
+        usage = get_usage(stats)
+        
         # Determine animation state based on usage
-        if usage >= walk_threshold:
+        if usage >= thresholds.get(walk_key, walk_default):
             return "run"
-        elif usage >= idle_threshold:
+        elif usage >= thresholds.get(idle_key, idle_default):
             return "walk"
         else:
             return "idle"
     
     def determine_emotion_state(self, stats: SystemStats, 
-                              emotion_thresholds: Dict[str, Dict]) -> str:
+                              emotion_thresholds: "EmotionThresholds") -> str:
         """
         Determine penguin emotion based on comprehensive system analysis.
         
         Args:
             stats: Current system statistics
-            emotion_thresholds: Emotion-based threshold configuration
+            emotion_thresholds: Emotion thresholds, see ConfigManager.get_emotion_threshold_values
             
         Returns:
             Emotion state: 'calm', 'active', 'busy', 'stressed', or 'overloaded'
         """
-        cpu = stats.cpu_percent
-        ram = stats.ram_percent
-        network = stats.network_kbps
-        
-        # Check for overloaded state first (highest priority)
-        overload_config = emotion_thresholds.get('overloaded', {})
-        any_critical_threshold = overload_config.get('any_critical_threshold', 85)
-        
-        if (cpu >= overload_config.get('cpu_critical', 90) or
-            ram >= overload_config.get('ram_critical', 90) or
-            network >= overload_config.get('network_critical_kbps', 2000) or
-            cpu >= any_critical_threshold or
-            ram >= any_critical_threshold):
-            return "overloaded"
+        return EMOTION_STATES[_classify_emotion(
+            stats.cpu_percent, stats.ram_percent, stats.network_kbps, emotion_thresholds
+        )]
+    
+    def poll_and_classify(self, mode: str, thresholds: Union[Dict[str, int], "EmotionThresholds"]
+                          ) -> Tuple[SystemStats, str, Optional[EmotionAnalysis]]:
+        """
+        Sample system stats and classify them in one pass.
         
-        # Check for stressed state (multiple resources high)
-        stressed_config = emotion_thresholds.get('stressed', {})
-        high_resources = 0
-        if cpu >= stressed_config.get('cpu_high', 70):
-            high_resources += 1
-        if ram >= stressed_config.get('ram_high', 75):
-            high_resources += 1
-        if network >= stressed_config.get('network_high_kbps', 800):
-            high_resources += 1
+        Args:
+            mode: Monitoring mode ('cpu', 'ram', 'network', 'emotion')
+            thresholds: Threshold values for the mode (EmotionThresholds in emotion mode)
             
-        if high_resources >= 2:
-            return "stressed"
-        
-        # Check for busy state (single resource high)
-        busy_config = emotion_thresholds.get('busy', {})
-        single_threshold = busy_config.get('single_resource_threshold', 60)
-        if cpu >= single_threshold or ram >= single_threshold or network >= single_threshold*10:  # network scaled
-            return "busy"
+        Returns:
+            Tuple of (stats, animation state, emotion analysis or None outside emotion mode)
+        """
+        stats = self.get_system_stats()
         
-        # Check for calm state (all resources low)
-        calm_config = emotion_thresholds.get('calm', {})
-        if (cpu <= calm_config.get('cpu_max', 20) and
-            ram <= calm_config.get('ram_max', 30) and
-            network <= calm_config.get('network_max_kbps', 50)):
-            return "calm"
+        if mode == "emotion":
+            # The tooltip only needs the summary, so skip formatting stressor text
+            analysis = self.get_emotion_analysis(stats, thresholds, detailed=False)
+            return stats, analysis.emotion, analysis
         
-        # Default to active state (normal activity)
-        return "active"
+        return stats, self.determine_animation_state(stats, mode, thresholds), None
     
     def get_emotion_analysis(self, stats: SystemStats, 
-                           emotion_thresholds: Dict[str, Dict]) -> Dict[str, any]:
+                           emotion_thresholds: "EmotionThresholds",
+                           detailed: bool = True) -> EmotionAnalysis:
         """
         Get detailed emotion analysis for debugging and user information.
         
         Args:
             stats: Current system statistics
-            emotion_thresholds: Emotion-based threshold configuration
+            emotion_thresholds: Emotion thresholds, see ConfigManager.get_emotion_threshold_values
+            detailed: Fill in the formatted active_stressors; stressor_mask is always
+                set for callers that only need to know which are active
             
         Returns:
-            Dictionary with emotion state and analysis details
+            EmotionAnalysis with emotion state and analysis details
         """
-        emotion = self.determine_emotion_state(stats, emotion_thresholds)
-        
-        # Calculate resource stress levels (0-100)
-        cpu_stress = min(100, stats.cpu_percent)
-        ram_stress = min(100, stats.ram_percent)
-        network_stress = min(100, stats.network_kbps / 20)  # Scale network to 0-100
+        cpu, ram, network = stats.cpu_percent, stats.ram_percent, stats.network_kbps
+        emotion = EMOTION_STATES[_classify_emotion(cpu, ram, network, emotion_thresholds)]
+        cpu_stress, ram_stress, network_stress = _stress_levels(cpu, ram, network)
         
         overall_stress = (cpu_stress + ram_stress + network_stress) / 3
+        mask = stressor_mask(stats)
         
-        return {
-            "emotion": emotion,
-            "overall_stress": round(overall_stress, 1),
-            "resource_levels": {
-                "cpu": round(cpu_stress, 1),
-                "ram": round(ram_stress, 1),
-                "network": round(network_stress, 1)
-            },
-            "active_stressors": self._identify_active_stressors(stats),
-            "description": emotion_thresholds.get(emotion, {}).get('description', f'System in {emotion} state')
-        }
+        return EmotionAnalysis(
+            emotion=emotion,
+            overall_stress=round(overall_stress, 1),
+            cpu_stress=round(cpu_stress, 1),
+            ram_stress=round(ram_stress, 1),
+            network_stress=round(network_stress, 1),
+            stressor_mask=mask,
+            description=emotion_thresholds.descriptions.get(emotion, f'System in {emotion} state'),
+            active_stressors=self._identify_active_stressors(stats, mask) if detailed else ()
+        )
     
-    def _identify_active_stressors(self, stats: SystemStats) -> list:
-        """Identify which resources are causing system stress."""
+    def _identify_active_stressors(self, stats: SystemStats, mask: int) -> Tuple[str, ...]:
+        """Describe the resources flagged in a stressor_mask."""
         stressors = []
         
-        if stats.cpu_percent > 70:
+        if mask & STRESSOR_CPU:
             stressors.append(f"High CPU ({stats.cpu_percent:.1f}%)")
-        if stats.ram_percent > 75:
+        if mask & STRESSOR_RAM:
             stressors.append(f"High RAM ({stats.ram_percent:.1f}%)")
-        if stats.network_kbps > 800:
+        if mask & STRESSOR_NETWORK:
             stressors.append(f"High Network ({stats.network_kbps:.1f} KB/s)")
             
-        return stressors
+        return tuple(stressors)
     
     def get_system_info(self) -> Dict[str, str]:
         """Get basic system information for debugging."""
@@ -283,6 +429,7 @@ def main():
     print()
     
     try:
+        deadline = time.monotonic()
         for i in range(5):
             stats = monitor.get_system_stats()
             print(f"Sample {i+1}:")
@@ -297,7 +444,9 @@ def main():
             print(f"  Animation state (CPU mode): {cpu_state}")
             print()
             
-            time.sleep(1)
+            # Sleep to the next deadline so printing doesn't stretch the interval
+            deadline += 1
+            time.sleep(max(0.0, deadline - time.monotonic()))
             
     except KeyboardInterrupt:
         print("Test interrupted by user")
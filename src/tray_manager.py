@@ -3,6 +3,7 @@ Tray Manager for TuxTray
 Handles system tray icon, context menu, and Linux desktop integration.
 """
 
+import logging
 import sys
 from typing import Optional, Dict, Callable
 from PySide6.QtWidgets import (QSystemTrayIcon, QMenu, 
@@ -13,6 +14,8 @@ from PySide6.QtCore import QObject, Signal
 from .config_manager import ConfigManager
 from .animation_engine import AnimationEngine
 
+log = logging.getLogger(__name__)
+
 
 class TrayManager(QObject):
     """Manages the system tray icon and context menu for TuxTray."""
@@ -31,14 +34,16 @@ class TrayManager(QObject):
         self.animation_engine = animation_engine
         self.tray_icon: Optional[QSystemTrayIcon] = None
         self.context_menu: Optional[QMenu] = None
+        self._fallback_icon: Optional[QIcon] = None
         
         # Action groups for radio button behavior
         self.animation_mode_group: Optional[QActionGroup] = None
         self.skin_group: Optional[QActionGroup] = None
+        self.skin_menu: Optional[QMenu] = None
         
         # Check if system tray is available
         if not QSystemTrayIcon.isSystemTrayAvailable():
-            print("Warning: System tray is not available on this system")
+            log.warning("System tray is not available on this system")
             return
         
         self._create_tray_icon()
@@ -50,9 +55,9 @@ class TrayManager(QObject):
         self.tray_icon = QSystemTrayIcon(self)
         
         # Set initial icon (will be updated by animation)
-        initial_pixmap = self.animation_engine.get_current_frame()
-        if not initial_pixmap.isNull():
-            self.tray_icon.setIcon(QIcon(initial_pixmap))
+        initial_icon = self.animation_engine.get_current_icon()
+        if not initial_icon.isNull():
+            self.tray_icon.setIcon(initial_icon)
         else:
             # Fallback to default icon if animation isn't ready
             self._set_fallback_icon()
@@ -65,12 +70,15 @@ class TrayManager(QObject):
     
     def _set_fallback_icon(self) -> None:
         """Set a fallback icon when animation frames aren't available."""
-        # Create a simple colored square as fallback
-        fallback_pixmap = QPixmap(32, 32)
-        fallback_pixmap.fill(0x2196F3)  # Blue color
+        if self._fallback_icon is None:
+            # Create a simple colored square as fallback, at the size frames are decoded to
+            size = self.config.tray_icon_size
+            fallback_pixmap = QPixmap(size, size)
+            fallback_pixmap.fill(0x2196F3)  # Blue color
+            self._fallback_icon = QIcon(fallback_pixmap)
         
         if self.tray_icon:
-            self.tray_icon.setIcon(QIcon(fallback_pixmap))
+            self.tray_icon.setIcon(self._fallback_icon)
     
     def _create_context_menu(self) -> None:
         """Create the right-click context menu."""
@@ -105,21 +113,14 @@ class TrayManager(QObject):
         self.animation_mode_group.triggered.connect(self._on_animation_mode_changed)
         
         # Penguin Skin submenu
-        skin_menu = QMenu("Penguin Skin", self.context_menu)
-        self.skin_group = QActionGroup(self)
-        self.skin_group.setExclusive(True)
-        
-        self._populate_skin_menu(skin_menu)
-        
-        # Connect skin group
-        self.skin_group.triggered.connect(self._on_skin_changed)
+        self._build_skin_menu()
         
         # Separator
         self.context_menu.addSeparator()
         
         # Add main menu items
         self.context_menu.addMenu(mode_menu)
-        self.context_menu.addMenu(skin_menu)
+        self.context_menu.addMenu(self.skin_menu)
         
         self.context_menu.addSeparator()
         
@@ -138,6 +139,17 @@ class TrayManager(QObject):
         # Set the context menu
         self.tray_icon.setContextMenu(self.context_menu)
     
+    def _build_skin_menu(self) -> None:
+        """Create the skin submenu and its action group."""
+        self.skin_menu = QMenu("Penguin Skin", self.context_menu)
+        self.skin_group = QActionGroup(self)
+        self.skin_group.setExclusive(True)
+        
+        self._populate_skin_menu(self.skin_menu)
+        
+        # Connect skin group
+        self.skin_group.triggered.connect(self._on_skin_changed)
+    
     def _populate_skin_menu(self, skin_menu: QMenu) -> None:
         """Populate the skin selection menu."""
         available_skins = self.config.get_available_skins()
@@ -145,14 +157,15 @@ class TrayManager(QObject):
         
         if not available_skins:
             # No skins available
-            no_skins_action = QAction("No skins available", self)
+            no_skins_action = QAction("No skins available", skin_menu)
             no_skins_action.setEnabled(False)
             skin_menu.addAction(no_skins_action)
             return
         
         # Add skin options
         for skin_id, skin_name in available_skins.items():
-            action = QAction(skin_name, self)
+            # Owned by the menu so they are freed along with it
+            action = QAction(skin_name, skin_menu)
             action.setCheckable(True)
             action.setChecked(skin_id == current_skin)
             action.setData(skin_id)  # Store skin identifier
@@ -169,10 +182,10 @@ class TrayManager(QObject):
         if self.tray_icon:
             self.tray_icon.activated.connect(self._on_tray_activated)
     
-    def _on_frame_changed(self, pixmap: QPixmap) -> None:
+    def _on_frame_changed(self, icon: QIcon) -> None:
         """Handle animation frame changes."""
-        if self.tray_icon and not pixmap.isNull():
-            self.tray_icon.setIcon(QIcon(pixmap))
+        # Connected only once tray_icon exists, and frames are validated at load
+        self.tray_icon.setIcon(icon)
     
     def _on_tray_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         """Handle tray icon activation."""
@@ -185,10 +198,9 @@ class TrayManager(QObject):
         mode = action.data()
         if mode and mode != self.config.animation_mode:
             self.config.animation_mode = mode
-            self.config.save_config()
-            self.animation_mode_changed.emit(mode)
             
-            # Update tooltip
+            # Placeholder tooltip; set before emitting so the stats tooltip written
+            # by the mode change handler replaces it rather than the other way round
             mode_names = {
                 "emotion": "Emotion-Based Monitor",
                 "cpu": "CPU Usage Monitor",
@@ -199,13 +211,14 @@ class TrayManager(QObject):
             
             if self.tray_icon:
                 self.tray_icon.setToolTip(tooltip)
+            
+            self.animation_mode_changed.emit(mode)
     
     def _on_skin_changed(self, action: QAction) -> None:
         """Handle skin change."""
         skin_id = action.data()
         if skin_id and skin_id != self.config.current_skin:
             if self.animation_engine.set_skin(skin_id):
-                self.config.save_config()
                 self.skin_changed.emit(skin_id)
                 
                 # Show notification
@@ -281,27 +294,18 @@ class TrayManager(QObject):
     
     def refresh_skin_menu(self) -> None:
         """Refresh the skin menu (call when new skins are added)."""
-        if self.context_menu and self.skin_group:
-            # Find and remove old skin menu
-            for action in self.context_menu.actions():
-                if action.menu() and action.menu().title() == "Penguin Skin":
-                    self.context_menu.removeAction(action)
-                    action.menu().deleteLater()
-                    break
-            
-            # Clear old skin actions
-            for action in self.skin_group.actions():
-                self.skin_group.removeAction(action)
-                action.deleteLater()
-            
-            # Create new skin menu
-            skin_menu = QMenu("Penguin Skin", self.context_menu)
-            self._populate_skin_menu(skin_menu)
-            
-            # Insert before the separator
-            actions = self.context_menu.actions()
-            if len(actions) >= 2:
-                self.context_menu.insertMenu(actions[1], skin_menu)
+        if not (self.context_menu and self.skin_menu):
+            return
+        
+        # Build the replacement off-screen, then swap it into the old menu's slot
+        old_menu, old_group = self.skin_menu, self.skin_group
+        self._build_skin_menu()
+        self.context_menu.insertMenu(old_menu.menuAction(), self.skin_menu)
+        self.context_menu.removeAction(old_menu.menuAction())
+        
+        # The old skin actions are children of the old menu and go with it
+        old_menu.deleteLater()
+        old_group.deleteLater()
 
 
 # Testing function
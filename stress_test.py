@@ -4,43 +4,41 @@ CPU Stress Test for TuxTray Animation
 Generate CPU load to test animation state changes.
 """
 
+import asyncio
 import sys
 import time
 import threading
 import multiprocessing
 from pathlib import Path
 
+from cpu_load import cpu_worker
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.system_monitor import SystemMonitor
-from src.config_manager import ConfigManager
+STATE_EMOJI = {"idle": "🟢", "walk": "🟡", "run": "🔴"}
 
 def cpu_stress(duration=10):
     """Generate CPU stress for testing."""
     print(f"🔥 Starting CPU stress test for {duration} seconds...")
     
-    def stress_worker():
-        """CPU intensive task."""
-        end_time = time.time() + duration
-        while time.time() < end_time:
-            # CPU intensive calculation
-            sum(i * i for i in range(10000))
-    
-    # Start multiple threads to stress CPU
-    threads = []
+    # Threads share the GIL and only load one core, so start a process per core
+    processes = []
     cpu_count = multiprocessing.cpu_count()
     
     for i in range(cpu_count):
-        thread = threading.Thread(target=stress_worker)
-        thread.daemon = True
-        thread.start()
-        threads.append(thread)
+        process = multiprocessing.Process(target=cpu_worker, args=(10000, duration, 0))
+        process.daemon = True
+        process.start()
+        processes.append(process)
     
-    return threads
+    return processes
 
 def monitor_animation_states():
     """Monitor system stats and expected animation states."""
+    from src.system_monitor import SystemMonitor
+    from src.config_manager import ConfigManager
+    
     config = ConfigManager()
     monitor = SystemMonitor()
     
@@ -48,17 +46,21 @@ def monitor_animation_states():
     print("Legend: 🟢 idle (<30%) | 🟡 walk (30-80%) | 🔴 run (>80%)")
     print()
     
-    for i in range(20):  # Monitor for 20 seconds
-        stats = monitor.get_system_stats()
-        thresholds = config.get_thresholds("cpu")
+    # Thresholds don't change while monitoring, so look them up once
+    thresholds = config.get_thresholds("cpu")
+    write = sys.stdout.write
+    sample = 0
+    
+    def on_stats(stats):
+        nonlocal sample
+        sample += 1
         state = monitor.determine_animation_state(stats, "cpu", thresholds)
         
-        # Determine emoji based on state
-        emoji = "🟢" if state == "idle" else "🟡" if state == "walk" else "🔴"
-        
-        print(f"[{i+1:2d}s] CPU: {stats.cpu_percent:5.1f}% | State: {emoji} {state:<4} | RAM: {stats.ram_percent:4.1f}% | Net: {stats.network_kbps:6.1f} KB/s")
-        
-        time.sleep(1)
+        # One write per sample; print() would issue a second one for the newline
+        write(f"[{sample:2d}s] CPU: {stats.cpu_percent:5.1f}% | State: {STATE_EMOJI[state]} {state:<4} | RAM: {stats.ram_percent:4.1f}% | Net: {stats.network_kbps:6.1f} KB/s\n")
+    
+    # Monitor for 20 seconds
+    asyncio.run(monitor.run(1.0, on_stats, samples=20))
 
 def main():
     """Run stress test and monitor animation states."""
@@ -79,11 +81,11 @@ def main():
     print("Should show: 🟡 walk → 🔴 run states")
     
     # Start CPU stress
-    stress_threads = cpu_stress(10)
+    stress_processes = cpu_stress(10)
     
     # Wait for stress test to complete
-    for thread in stress_threads:
-        thread.join()
+    for process in stress_processes:
+        process.join()
     
     print("\nPhase 3: Cool down (5 seconds)")
     print("Should show: 🔴 run → 🟡 walk → 🟢 idle states")